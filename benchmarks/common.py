@@ -0,0 +1,30 @@
+import time
+import tracemalloc
+from typing import Callable
+
+
+def measure(func: Callable, *args, setup: Callable = None, **kwargs) -> tuple[object, float, int]:
+    """
+    Calls `func` twice and returns its result, wall-clock time in seconds and peak traced memory in bytes.
+    Memory is traced in a separate call, tracing would otherwise distort the timing.
+    `setup` is called before each of the calls and is not measured.
+    """
+    if setup is not None:
+        setup()
+
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+
+    if setup is not None:
+        setup()
+
+    tracemalloc.start()
+    try:
+        func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+
+    finally:
+        tracemalloc.stop()
+
+    return result, elapsed, peak
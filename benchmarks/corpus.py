@@ -0,0 +1,116 @@
+"""
+Generator of synthetic API docs shaped like the responses of https://developer.riotgames.com/api-details/{name}.
+
+    python -m benchmarks.corpus --resources 80 --output input
+"""
+import html
+import random
+from argparse import ArgumentParser
+
+from docs_parser.input_store import InputStore
+
+API_BASES = ("lol", "lor", "val", "tft", "riot")
+PROPERTY_TYPES = (
+    "int", "long", "string", "boolean", "double", "float",
+    "List[string]", "List[long]", "Set[string]", "Map[String, string]",
+)
+WORDS = ("the", "match", "player", "champion", "ranked", "queue", "value", "of", "in", "game", "is", "id",
+         "timestamp", "encrypted", "summoner", "region", "when", "which", "data")
+
+
+def _sentence(rnd: random.Random, min_words: int, max_words: int) -> str:
+    return " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(min_words, max_words))).capitalize()
+
+
+def _object_html(rnd: random.Random, name: str, properties: list[tuple[str, str, str]]) -> str:
+    # both heading variants used by the docs are generated
+    if rnd.random() < 0.5:
+        heading = f"<h5>{name}</h5>"
+
+    else:
+        heading = f"<div><b>{name}</b> - {_sentence(rnd, 3, 8)}</div>"
+
+    rows = "".join(
+        f"<tr><td>{prop_name}</td><td>{html.escape(prop_type)}</td><td>{prop_desc}</td></tr>"
+        for prop_name, prop_type, prop_desc in properties
+    )
+    return (
+        f'<div class="response_body">{heading}'
+        f"<table><thead><tr><th>Name</th><th>Data Type</th><th>Description</th></tr></thead>"
+        f"<tbody>{rows}</tbody></table></div>"
+    )
+
+
+def generate_corpus(resources: int = 80, operations: int = 6, objects_per_operation: int = 4,
+                    properties: int = 12, shared_objects: int = 20, seed: int = 0) -> dict[str, str]:
+    """
+    Generates HTML of `resources` APIs keyed by API name in the landing page order.
+
+    Each operation returns `objects_per_operation` object definitions. Part of them are drawn from a pool of
+    `shared_objects` objects referenced by many resources, so definitions and sources get merged
+    the same way they do for the real docs.
+    """
+    rnd = random.Random(seed)
+    shared_pool = [
+        (f"Shared{index}DTO", [
+            (f"shared{prop_index}", rnd.choice(PROPERTY_TYPES), _sentence(rnd, 0, 30))
+            for prop_index in range(properties)
+        ])
+        for index in range(shared_objects)
+    ]
+
+    apis = {}
+    for resource_index in range(resources):
+        resource_id = 1000 + resource_index
+        api_name = f"resource{resource_index}-v{resource_index % 5 + 1}"
+        base = API_BASES[resource_index % len(API_BASES)]
+        parts = [
+            f'<div class="resource" id="resource_{resource_id}" api-name="{api_name}">'
+            f'<a href="#{api_name}">{api_name}</a><ul class="operations">'
+        ]
+        for operation_index in range(operations):
+            operation_id = f"getResource{resource_index}Operation{operation_index}"
+            own_objects = [
+                (f"Resource{resource_index}Object{operation_index}x{index}Dto", [
+                    (f"property{prop_index}", rnd.choice(PROPERTY_TYPES + (f"List[Shared{index}DTO]",)),
+                     _sentence(rnd, 0, 30))
+                    for prop_index in range(properties)
+                ])
+                for index in range(objects_per_operation // 2)
+            ]
+            objects = own_objects + rnd.sample(shared_pool, objects_per_operation - len(own_objects))
+            parts.append(
+                f'<li class="operation"><a href="#{api_name}/GET_{operation_id}">{operation_id}</a>'
+                f'<span class="path"> /{base}/resource{resource_index}/v1/operation{operation_index}/{{id}} </span>'
+                f'<div class="response_body">Return value: {objects[0][0]}</div>'
+            )
+            parts.extend(_object_html(rnd, name, props) for name, props in objects)
+            parts.append("</li>")
+
+        parts.append("</ul></div>")
+        apis[api_name] = "".join(parts)
+
+    return apis
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--resources", type=int, default=80)
+    parser.add_argument("--operations", type=int, default=6)
+    parser.add_argument("--objects", help="objects per operation", type=int, default=4)
+    parser.add_argument("--properties", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="input directory to write the corpus shards to", default="input")
+    args = parser.parse_args()
+
+    apis = generate_corpus(args.resources, args.operations, args.objects, args.properties, seed=args.seed)
+    store = InputStore(args.output)
+    for api_name, api_html in apis.items():
+        store.write_shard(api_name, api_html)
+
+    store.write_manifest(list(apis))
+    print(f"written {len(apis)} API shards, {sum(map(len, apis.values())) / 2 ** 20:.1f}MiB, to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compares wall-clock time of the sequential and concurrent `download()` paths against a local stub server.
+With `--rate-limit`, the stub throttles requests and the downloads are sent through the request scheduler.
+
+    python -m benchmarks.download --apis 40 --latency 0.05 --workers 1 4 8
+    python -m benchmarks.download --apis 200 --latency 0.01 --workers 8 --rate-limit 50
+"""
+import os
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from docs_parser.run import download
+from docs_parser.scheduler import RequestScheduler
+from tests.stub_server import StubDocsServer
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--apis", help="number of APIs served by the stub", type=int, default=40)
+    parser.add_argument("--latency", help="artificial latency of each response in seconds", type=float, default=0.05)
+    parser.add_argument("--workers", help="worker counts to benchmark", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--rate-limit", help="requests per second allowed by the stub", type=float, default=None)
+    parser.add_argument("--max-rate", help="maximum rate of the request scheduler", type=float, default=100.0)
+    args = parser.parse_args()
+
+    apis = {f"api{i}-v1": f'<div class="resource" id="resource_{i}" api-name="api{i}-v1"></div>'
+            for i in range(args.apis)}
+    expected = "".join(apis.values())
+
+    with StubDocsServer(apis, latency=args.latency, rate_limit=args.rate_limit) as stub, tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        os.mkdir("input")
+        try:
+            baseline = None
+            for workers in args.workers:
+                scheduler = None
+                if args.rate_limit is not None:
+                    scheduler = RequestScheduler(max_rate=args.max_rate)
+
+                throttled = stub.throttled_count
+                start = time.perf_counter()
+                store = download(workers=workers, base_url=stub.base_url, scheduler=scheduler)
+                elapsed = time.perf_counter() - start
+                assert "".join(store) == expected, "downloaded content does not match the landing page order"
+
+                baseline = baseline or elapsed
+                line = f"workers={workers:<3d} {elapsed:8.3f}s  speedup={baseline / elapsed:5.2f}x"
+                if scheduler is not None:
+                    line += (f"  throughput={(len(apis) + 1) / elapsed:6.2f} req/s  "
+                             f"throttled={stub.throttled_count - throttled}  final rate={scheduler.rate:.2f} req/s")
+
+                print(line)
+
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main()
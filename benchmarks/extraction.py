@@ -0,0 +1,60 @@
+"""
+Compares the select-based and the single-pass extraction of the raw resource data from parsed documents
+with every parser backend, and verifies both extractors produce identical parse results.
+
+    python -m benchmarks.extraction [--input input | --synthetic 80]
+"""
+import sys
+import time
+from argparse import ArgumentParser
+
+from bs4 import BeautifulSoup
+
+from docs_parser.extraction import EXTRACTORS
+from docs_parser.input_store import InputStore
+from docs_parser.run import PARSER_BACKENDS, parse
+from tests.helpers import canonical
+
+from .corpus import generate_corpus
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--input", help="input directory containing the downloaded docs", default="input")
+    parser.add_argument("--synthetic", help="use a synthetic corpus of this many resources instead of the input",
+                        type=int, default=None)
+    parser.add_argument("--parsers", help="parser backends to benchmark", nargs="+", default=PARSER_BACKENDS)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        documents = list(generate_corpus(args.synthetic).values())
+
+    else:
+        documents = list(InputStore(args.input))
+
+    mismatched = []
+    for backend in args.parsers:
+        # documents are parsed upfront, only the extraction itself is timed
+        soups = [BeautifulSoup(document, backend) for document in documents]
+        baseline = None
+        for name, extract in EXTRACTORS.items():
+            start = time.perf_counter()
+            for soup in soups:
+                extract(soup)
+
+            elapsed = time.perf_counter() - start
+            result = canonical(*parse(documents, parser=backend, extractor=name))
+            baseline = baseline or result
+            identical = result == baseline
+            if not identical:
+                mismatched.append((backend, name))
+
+            print(f"{backend:<12s} {name:<12s} {elapsed:8.3f}s  identical={identical}")
+
+    if mismatched:
+        print(f"output of {mismatched} differs from the single-pass extraction", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
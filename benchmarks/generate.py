@@ -0,0 +1,105 @@
+"""
+Compares wall-clock time of the serial and parallel `generate()` paths on a synthetic object set
+and verifies the generated files are byte-identical.
+
+    python -m benchmarks.generate --objects 2000 --workers 1 4
+"""
+import hashlib
+import os
+import random
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from docs_parser.objects import Resource, Operation, ObjectDefinition, ObjectProperty, Sources
+from docs_parser.run import generate
+
+API_BASES = ("lol", "lor", "val", "tft", "riot")
+PROPERTY_TYPES = ("int", "long", "string", "boolean", "double", "float", "List[string]", "List[long]")
+
+
+def synthetic_model(object_count: int, resource_count: int = 50, operation_count: int = 8,
+                    property_count: int = 20, seed: int = 0) -> tuple[list[Resource], list[ObjectDefinition]]:
+    rnd = random.Random(seed)
+    resources = []
+    for resource_id in range(resource_count):
+        resource = Resource(id=resource_id, name=f"resource{resource_id}", version="v1",
+                            api_link=f"#resource{resource_id}-v1", operations=[])
+        base = API_BASES[resource_id % len(API_BASES)]
+        for operation_id in range(operation_count):
+            resource.operations.append(Operation(
+                id=f"getResource{resource_id}Thing{operation_id}",
+                method="GET",
+                returns="_unknown_",
+                docs_link=f"https://developer.riotgames.com/apis#resource{resource_id}-v1/GET_{operation_id}",
+                api_path=f"/{base}/resource{resource_id}/v1/things/{operation_id}",
+            ))
+
+        resources.append(resource)
+
+    objects = []
+    for object_id in range(object_count):
+        obj = ObjectDefinition(name=f"Object{object_id}Dto", description="", properties={}, sources=Sources())
+        for resource in rnd.sample(resources, 3):
+            for operation in rnd.sample(resource.operations, 2):
+                obj.sources.add(resource, operation)
+
+        for property_id in range(property_count):
+            prop = ObjectProperty(
+                name=f"property{property_id}",
+                type=rnd.choice(PROPERTY_TYPES),
+                description=" ".join(["lorem ipsum dolor sit amet"] * rnd.randrange(1, 8)),
+                sources=Sources(),
+            )
+            for resource, operations in obj.sources.items():
+                prop.sources.add(resource, rnd.choice(sorted(operations, key=lambda op: op.id)))
+
+            obj.properties[prop.name] = prop
+
+        objects.append(obj)
+
+    return resources, objects
+
+
+def tree_digest(directory: str) -> str:
+    digest = hashlib.sha256()
+    for dirpath, dirnames, filenames in os.walk(directory):
+        dirnames.sort()
+        for filename in sorted(filenames):
+            filepath = os.path.join(dirpath, filename)
+            digest.update(os.path.relpath(filepath, directory).encode("utf-8"))
+            with open(filepath, "rb") as fd:
+                digest.update(fd.read())
+
+    return digest.hexdigest()
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--objects", help="number of synthetic objects", type=int, default=2000)
+    parser.add_argument("--workers", help="worker counts to benchmark", type=int, nargs="+", default=[1, 4])
+    args = parser.parse_args()
+
+    resources, objects = synthetic_model(args.objects)
+    cwd = os.getcwd()
+    baseline_time, baseline_digest = None, None
+    for workers in args.workers:
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            try:
+                start = time.perf_counter()
+                generate(resources, objects, workers=workers)
+                elapsed = time.perf_counter() - start
+                digest = tree_digest("output")
+
+            finally:
+                os.chdir(cwd)
+
+        baseline_time = baseline_time or elapsed
+        baseline_digest = baseline_digest or digest
+        print(f"workers={workers:<3d} {elapsed:8.3f}s  speedup={baseline_time / elapsed:5.2f}x  "
+              f"identical={digest == baseline_digest}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+"""
+Measures memory retained by the parsed object model of a synthetic corpus.
+
+    python -m benchmarks.memory --resources 200
+"""
+import gc
+import tracemalloc
+from argparse import ArgumentParser
+
+from docs_parser.run import parse
+from .corpus import generate_corpus
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--resources", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    documents = list(generate_corpus(args.resources, seed=args.seed).values())
+
+    gc.collect()
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    resources, objects = parse(documents, parser="lxml")
+    gc.collect()
+    retained, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    retained -= baseline
+    properties = sum(len(obj.properties) for obj in objects)
+    print(f"resources={len(resources)} objects={len(objects)} properties={properties}")
+    print(f"retained={retained / 2 ** 20:.2f}MiB  per object={retained / len(objects):.0f}B  "
+          f"per object or property={retained / (len(objects) + properties):.0f}B")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""
+Parses the downloaded docs (or a synthetic corpus) with every parser backend, reports parse time and peak memory
+and verifies that every backend produces output identical to html5lib. Output of the committed golden corpus
+is verified by `tests/test_parsers.py`.
+
+    python -m benchmarks.parsers [--input input | --synthetic 80]
+"""
+import sys
+from argparse import ArgumentParser
+
+from docs_parser.input_store import InputStore
+from docs_parser.run import PARSER_BACKENDS, parse
+from tests.helpers import canonical
+
+from .common import measure
+from .corpus import generate_corpus
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--input", help="input directory containing the downloaded docs", default="input")
+    parser.add_argument("--synthetic", help="use a synthetic corpus of this many resources instead of the input",
+                        type=int, default=None)
+    parser.add_argument("--parsers", help="parser backends to benchmark", nargs="+", default=PARSER_BACKENDS)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        documents = list(generate_corpus(args.synthetic).values())
+
+    else:
+        documents = list(InputStore(args.input))
+
+    golden = canonical(*parse(documents, parser="html5lib"))
+
+    mismatched = []
+    for backend in args.parsers:
+        result, elapsed, peak = measure(parse, documents, parser=backend)
+        identical = canonical(*result) == golden
+        if not identical:
+            mismatched.append(backend)
+
+        print(f"{backend:<12s} {elapsed:8.3f}s  peak={peak / 2 ** 20:8.1f}MiB  identical={identical}")
+
+    if mismatched:
+        print(f"output of {mismatched} differs from html5lib", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Measures rendering throughput of the PHP converter on a synthetic object set, using the built-in template
+and a custom template loaded from a file, and verifies both render identical contents.
+
+    python -m benchmarks.render --objects 2000 --repeat 3
+"""
+import os
+import shutil
+import tempfile
+import time
+from argparse import ArgumentParser
+
+from docs_parser.run import create_converter
+from .generate import synthetic_model
+
+
+def render_all(converter, objects) -> list[str]:
+    return [
+        converter.contents(obj, op)
+        for obj in objects
+        for _, op in sorted(converter.packages(obj), key=lambda package: package[0])
+    ]
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--objects", help="number of synthetic objects", type=int, default=2000)
+    parser.add_argument("--repeat", help="number of timed rendering passes", type=int, default=3)
+    args = parser.parse_args()
+
+    resources, objects = synthetic_model(args.objects)
+    with tempfile.TemporaryDirectory() as workdir:
+        custom_template = os.path.join(workdir, "class.php.tpl")
+        shutil.copyfile(create_converter("php", resources).default_template_path, custom_template)
+
+        baseline = None
+        for name, template_path in (("built-in", None), ("custom", custom_template)):
+            converter = create_converter("php", resources, template_path)
+            converter.prepare(objects)
+
+            best = None
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                rendered = render_all(converter, objects)
+                elapsed = time.perf_counter() - start
+                best = min(best or elapsed, elapsed)
+
+            baseline = baseline or rendered
+            size = sum(map(len, rendered))
+            print(f"{name:<9s} files={len(rendered)} {best:8.3f}s  {len(rendered) / best:9.0f} files/s  "
+                  f"{size / best / 2 ** 20:7.2f}MiB/s  identical={rendered == baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+"""
+Compares wall-clock time of parsing and generating a synthetic corpus in full and restricted to resource selections,
+and verifies each selection parses the same resources, objects and sources as the full model restricted to it.
+
+    python -m benchmarks.selection --resources 80 --include api=resource7-v3 --include base=tft
+"""
+import sys
+import time
+from argparse import ArgumentParser
+
+from docs_parser.output_sink import MemorySink
+from docs_parser.run import create_selection, generate, parse
+from tests.helpers import canonical
+
+from .corpus import generate_corpus
+
+
+def shape(resources, objects) -> tuple:
+    # definitions of merged objects depend on which resource came first, only their sources are compared
+    resource_data, object_data = canonical(resources, objects)
+    return resource_data, sorted(
+        (name, sources, sorted((prop[0], prop[-1]) for prop in properties))
+        for name, _, sources, properties in object_data
+    )
+
+
+def parse_and_generate(documents: list[str], selection) -> tuple[tuple, int, float]:
+    start = time.perf_counter()
+    resources, objects = parse(documents, selection=selection)
+    sink = MemorySink()
+    generate(resources, objects, sink=sink)
+    return (resources, objects), len(sink.files), time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--resources", help="number of synthetic resources", type=int, default=80)
+    parser.add_argument("--include", help="include criteria to benchmark, each one separately",
+                        action="append", default=None, metavar="KEY=VALUE")
+    args = parser.parse_args()
+
+    documents = list(generate_corpus(args.resources).values())
+    full, files, baseline = parse_and_generate(documents, None)
+    print(f"{'full':<20s} resources={len(full[0]):<4d} files={files:<6d} {baseline:8.3f}s")
+
+    mismatched = []
+    for criterion in args.include or ["api=resource7-v3", "base=tft"]:
+        selection = create_selection([criterion])
+        model, files, elapsed = parse_and_generate(documents, selection)
+        identical = shape(*model) == shape(*selection.apply(*full))
+        if not identical:
+            mismatched.append(criterion)
+
+        print(f"{criterion:<20s} resources={len(model[0]):<4d} files={files:<6d} {elapsed:8.3f}s  "
+              f"speedup={baseline / elapsed:6.2f}x  identical={identical}")
+
+    if mismatched:
+        print(f"selections {mismatched} differ from the restricted full model", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compares wall-clock time of generating a synthetic object set in one process and split into shards generated
+by concurrent processes (each into its own directory, as independent machines would) followed by their merge,
+and verifies the merged output is identical to the unsharded one.
+
+    python -m benchmarks.shards --objects 2000 --shards 2 4
+"""
+import os
+import sys
+import tempfile
+import time
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+
+from docs_parser.output_sink import MemorySink
+from docs_parser.run import generate
+from docs_parser.sharding import Shard, merge_shards
+from .generate import synthetic_model
+
+
+def generate_shard(objects: int, shard: Shard, directory: str) -> float:
+    resources, objects = synthetic_model(objects)
+    os.makedirs(directory)
+    os.chdir(directory)
+    start = time.perf_counter()
+    generate(resources, objects, shard=shard)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--objects", help="number of synthetic objects", type=int, default=2000)
+    parser.add_argument("--shards", help="shard counts to benchmark", type=int, nargs="+", default=[2, 4])
+    args = parser.parse_args()
+
+    resources, objects = synthetic_model(args.objects)
+    unsharded = MemorySink()
+    start = time.perf_counter()
+    generate(resources, objects, sink=unsharded)
+    baseline_time = time.perf_counter() - start
+    print(f"unsharded {baseline_time:8.3f}s")
+
+    mismatched = []
+    for count in args.shards:
+        with tempfile.TemporaryDirectory() as workdir:
+            directories = [os.path.join(workdir, f"shard-{index}") for index in range(1, count + 1)]
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=count) as executor:
+                shard_times = list(executor.map(generate_shard, [args.objects] * count,
+                                                [Shard(index, count) for index in range(1, count + 1)], directories))
+
+            generated = time.perf_counter() - start
+            merged = MemorySink()
+            merge_shards(directories, merged)
+            elapsed = time.perf_counter() - start
+
+        identical = merged.files == unsharded.files
+        if not identical:
+            mismatched.append(count)
+
+        print(f"shards={count:<3d} {elapsed:8.3f}s  slowest shard={max(shard_times):7.3f}s  "
+              f"merge={elapsed - generated:7.3f}s  speedup={baseline_time / elapsed:5.2f}x  identical={identical}")
+
+    if mismatched:
+        print(f"merged output of {mismatched} shards differs from the unsharded output", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
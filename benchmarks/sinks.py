@@ -0,0 +1,84 @@
+"""
+Compares wall-clock time of `generate()` writing a synthetic object set into the output directory,
+into archives and into memory, and verifies every sink receives identical files.
+
+    python -m benchmarks.sinks --objects 2000
+"""
+import os
+import sys
+import tarfile
+import tempfile
+import time
+import zipfile
+from argparse import ArgumentParser
+
+from docs_parser.output_sink import DirectorySink, MemorySink, archive_sink
+from docs_parser.run import generate
+from .generate import synthetic_model
+
+
+def read_directory(directory: str) -> dict[str, bytes]:
+    files = {}
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            filepath = os.path.relpath(os.path.join(dirpath, filename))
+            with open(filepath, "rb") as fd:
+                files[filepath] = fd.read()
+
+    return files
+
+
+def read_archive(filepath: str) -> dict[str, bytes]:
+    if filepath.endswith(".zip"):
+        with zipfile.ZipFile(filepath) as archive:
+            return {name: archive.read(name) for name in archive.namelist()}
+
+    with tarfile.open(filepath) as archive:
+        return {member.name: archive.extractfile(member).read() for member in archive.getmembers()}
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--objects", help="number of synthetic objects", type=int, default=2000)
+    parser.add_argument("--workers", help="number of rendering processes", type=int, default=1)
+    args = parser.parse_args()
+
+    resources, objects = synthetic_model(args.objects)
+    cwd = os.getcwd()
+    baseline = None
+    mismatched = []
+    for name in ("directory", "output.tar", "output.tar.gz", "output.zip", "memory"):
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            try:
+                sink = DirectorySink() if name == "directory" else MemorySink() if name == "memory" \
+                    else archive_sink(name)
+                start = time.perf_counter()
+                generate(resources, objects, workers=args.workers, sink=sink)
+                elapsed = time.perf_counter() - start
+
+                if name in ("directory", "memory"):
+                    files = read_directory("output") if name == "directory" else sink.files
+                    size = sum(map(len, files.values()))
+
+                else:
+                    files = read_archive(name)
+                    size = os.path.getsize(name)
+
+            finally:
+                os.chdir(cwd)
+
+        baseline = baseline or files
+        identical = files == baseline
+        if not identical:
+            mismatched.append(name)
+
+        print(f"{name:<14s} files={len(files)} {elapsed:8.3f}s  size={size / 2 ** 20:7.2f}MiB  identical={identical}")
+
+    if mismatched:
+        print(f"files written to {mismatched} differ from the output directory", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+End-to-end benchmark of the download, parse and generate phases on a synthetic corpus served by a local stub.
+Reports wall-clock time and peak memory of each phase and optionally compares them against a saved baseline.
+
+    python -m benchmarks.suite --resources 80 --save-baseline baseline.json
+    python -m benchmarks.suite --resources 80 --baseline baseline.json --max-regression 0.2
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+from argparse import ArgumentParser
+
+from docs_parser.input_store import InputStore
+from docs_parser.run import PARSER_BACKENDS, download, generate, parse
+from tests.stub_server import StubDocsServer
+from .common import measure
+from .corpus import generate_corpus
+
+
+def run_suite(args) -> dict[str, dict[str, float]]:
+    apis = generate_corpus(args.resources, args.operations, args.objects, args.properties, seed=args.seed)
+    results = {}
+    with StubDocsServer(apis, latency=args.latency) as stub, tempfile.TemporaryDirectory() as workdir:
+        cwd = os.getcwd()
+        os.chdir(workdir)
+        try:
+            os.mkdir("input")
+            _, elapsed, peak = measure(download, workers=args.download_workers, base_url=stub.base_url)
+            results["download"] = {"time": elapsed, "peak": peak}
+
+            (resources, objects), elapsed, peak = measure(parse, InputStore(), parser=args.parser,
+                                                          workers=args.parse_workers)
+            results["parse"] = {"time": elapsed, "peak": peak}
+
+            def clean_output():
+                shutil.rmtree("output", ignore_errors=True)
+
+            _, elapsed, peak = measure(generate, resources, objects, workers=args.generate_workers,
+                                       setup=clean_output)
+            results["generate"] = {"time": elapsed, "peak": peak}
+
+        finally:
+            os.chdir(cwd)
+
+    return results
+
+
+def main():
+    parser = ArgumentParser()
+    parser.add_argument("--resources", type=int, default=80)
+    parser.add_argument("--operations", type=int, default=6)
+    parser.add_argument("--objects", help="objects per operation", type=int, default=4)
+    parser.add_argument("--properties", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--latency", help="artificial latency of each stub response in seconds",
+                        type=float, default=0.0)
+    parser.add_argument("--parser", choices=PARSER_BACKENDS, default="html5lib")
+    parser.add_argument("--download-workers", type=int, default=1)
+    parser.add_argument("--parse-workers", type=int, default=1)
+    parser.add_argument("--generate-workers", type=int, default=1)
+    parser.add_argument("--save-baseline", help="file to save the results to")
+    parser.add_argument("--baseline", help="file with previously saved results to compare against")
+    parser.add_argument("--max-regression", help="fail when a phase is slower than the baseline by this ratio",
+                        type=float, default=None)
+    args = parser.parse_args()
+
+    results = run_suite(args)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "r") as fd:
+            baseline = json.load(fd)["results"]
+
+    regressed = []
+    for phase, result in results.items():
+        line = f"{phase:<10s} {result['time']:8.3f}s  peak={result['peak'] / 2 ** 20:8.1f}MiB"
+        if baseline and phase in baseline:
+            time_change = result["time"] / baseline[phase]["time"] - 1
+            peak_change = result["peak"] / baseline[phase]["peak"] - 1
+            line += f"  time={time_change:+7.1%}  peak={peak_change:+7.1%}"
+            if args.max_regression is not None and time_change > args.max_regression:
+                regressed.append(phase)
+
+        print(line)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as fd:
+            json.dump({"config": vars(args), "results": results}, fd, indent=2)
+
+    if regressed:
+        print(f"phases {regressed} regressed by more than {args.max_regression:.0%}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,20 +1,142 @@
 import os
 import logging.config
-from argparse import ArgumentParser
+from argparse import ArgumentParser, ArgumentTypeError
 
 import yaml
 
 import docs_parser
+from docs_parser.http_cache import HttpCache
+from docs_parser.parse_cache import ParseCache
+from docs_parser.profiling import profiler
+from docs_parser.snapshot_store import SnapshotStore
+from docs_parser.output_sink import DirectorySink, archive_sink
+from docs_parser.run import CONVERTERS, PARSER_BACKENDS, PARSER_VERSION, create_selection
+from docs_parser.scheduler import RequestScheduler
+from docs_parser.sharding import Shard, merge_shards
+from docs_parser.watch import Watcher
 
 
 log = logging.getLogger()
 
+
+def positive_int(value: str) -> int:
+    try:
+        number = int(value)
+
+    except ValueError:
+        raise ArgumentTypeError(f"invalid int value: '{value}'")
+
+    if number < 1:
+        raise ArgumentTypeError(f"expected a positive number, got {number}")
+
+    return number
+
+
 if __name__ == '__main__':
     parser = ArgumentParser()
 
     parser.add_argument("-d", "--download",
                         help="program will first download the latest version of the API docs",
                         action="store_true")
+    parser.add_argument("-s", "--stream",
+                        help="parse API details while the rest of them is still being downloaded",
+                        action="store_true")
+    parser.add_argument("--snapshot",
+                        help="archive the downloaded API details as a compressed snapshot in 'snapshots'",
+                        action="store_true")
+    parser.add_argument("--snapshot-keep",
+                        help="number of the latest snapshots to keep, older ones are removed",
+                        type=int, default=None)
+    parser.add_argument("--from-snapshot",
+                        help="parse the API details from this archived snapshot ('latest' for the newest one)",
+                        default=None)
+    parser.add_argument("-w", "--workers",
+                        help="number of API details pages to download concurrently",
+                        type=positive_int, default=1)
+    parser.add_argument("--max-rate",
+                        help="maximum number of requests per second, the rate adapts to throttling by the server",
+                        type=float, default=100.0)
+    parser.add_argument("--max-per-host",
+                        help="maximum number of concurrent requests to a single host",
+                        type=int, default=8)
+    parser.add_argument("-c", "--cache",
+                        help="reuse previously downloaded pages unless the server reports them as modified",
+                        action="store_true")
+    parser.add_argument("--cache-max-age",
+                        help="number of seconds a cached page is used without revalidation",
+                        type=float, default=0)
+    parser.add_argument("--cache-max-size",
+                        help="maximum size of the download cache in megabytes",
+                        type=float, default=None)
+    parser.add_argument("-p", "--parser",
+                        help="HTML parser backend used to parse the API docs, lxml is considerably faster",
+                        choices=PARSER_BACKENDS, default="html5lib")
+    parser.add_argument("-j", "--parse-workers",
+                        help="number of processes parsing the downloaded API details in parallel",
+                        type=positive_int, default=1)
+    parser.add_argument("--parse-cache",
+                        help="reuse parse results of API details which did not change since the previous run",
+                        action="store_true")
+    parser.add_argument("--include",
+                        help="process only resources matching this criterion, can be specified multiple times; "
+                             "criteria are KEY=VALUE with KEY one of id, name, version, api, base "
+                             "(e.g. base=tft, api=champion-mastery-v4, id=1420)",
+                        action="append", dest="include", default=[], metavar="KEY=VALUE")
+    parser.add_argument("--exclude",
+                        help="skip resources matching this criterion, can be specified multiple times",
+                        action="append", dest="exclude", default=[], metavar="KEY=VALUE")
+    parser.add_argument("-t", "--target",
+                        help="output target to generate, can be specified multiple times (default: php)",
+                        choices=CONVERTERS.keys(), action="append", dest="targets")
+    parser.add_argument("--template",
+                        help="custom output template of a target, specified as TARGET=PATH (e.g. php=class.php.tpl)",
+                        action="append", dest="templates", default=[])
+    parser.add_argument("--update-copyright-year",
+                        help="rewrite generated files whose only change is the copyright year",
+                        action="store_true")
+    parser.add_argument("--generate-workers",
+                        help="number of processes rendering the output files in parallel",
+                        type=positive_int, default=1)
+    parser.add_argument("--output-archive",
+                        help="write the generated files into this archive (.zip, .tar, .tar.gz, .tgz, .tar.bz2, "
+                             ".tar.xz) instead of the output directories",
+                        default=None)
+    parser.add_argument("--shard",
+                        help="generate only the shard INDEX/COUNT (e.g. 2/4) of the output files, "
+                             "shards are partitioned by package and object name",
+                        default=None)
+    parser.add_argument("--merge-shards",
+                        help="merge outputs of all shards (directories containing the output directories, "
+                             "or archives) into the output instead of generating it",
+                        nargs="+", default=None, metavar="SHARD_OUTPUT")
+    parser.add_argument("--dump-ir",
+                        help="write the parsed API docs into this intermediate representation file",
+                        default=None)
+    parser.add_argument("--diff-from",
+                        help="compare the API docs with this intermediate representation file, write the schema diff "
+                             "and regenerate only objects affected by the changes",
+                        default=None)
+    parser.add_argument("--diff-report",
+                        help="file the schema diff is written to",
+                        default="schema-diff.json")
+    parser.add_argument("--diff-only",
+                        help="only write the schema diff, do not generate the output",
+                        action="store_true")
+    parser.add_argument("--watch",
+                        help="keep running and poll the API docs every WATCH seconds, regenerating only changed objects",
+                        type=float, default=None, metavar="WATCH")
+    parser.add_argument("--from-ir",
+                        help="generate the output from this intermediate representation file instead of parsing",
+                        default=None)
+    parser.add_argument("--profile",
+                        help="record timings, memory usage and counters of the run into a JSON report",
+                        action="store_true")
+    parser.add_argument("--profile-report",
+                        help="file the profiling report is written to",
+                        default="profile.json")
+    parser.add_argument("--profile-pstats",
+                        help="directory to dump cProfile statistics of each phase to",
+                        default=None)
 
     args = parser.parse_args()
 
@@ -26,4 +148,103 @@ if __name__ == '__main__':
         logging_config = yaml.safe_load(fd)
         logging.config.dictConfig(logging_config)
 
-    docs_parser.run(run_download=args.download)
+    download_cache = None
+    if args.cache:
+        download_cache = HttpCache(
+            max_age=args.cache_max_age,
+            max_size=int(args.cache_max_size * 1024 * 1024) if args.cache_max_size is not None else None,
+        )
+
+    parse_cache = None
+    if args.parse_cache:
+        parse_cache = ParseCache(version=PARSER_VERSION)
+
+    scheduler = RequestScheduler(rate=min(10.0, args.max_rate), max_rate=args.max_rate,
+                                 max_per_host=args.max_per_host)
+
+    snapshots = None
+    if args.snapshot or args.from_snapshot:
+        snapshots = SnapshotStore()
+
+    if args.download and args.from_snapshot:
+        parser.error("--download and --from-snapshot can not be used together")
+
+    if args.from_snapshot:
+        snapshot_names = snapshots.names()
+        if not snapshot_names:
+            parser.error(f"there are no snapshots in '{snapshots.directory}'")
+
+        if args.from_snapshot != "latest" and args.from_snapshot not in snapshot_names:
+            parser.error(f"unknown snapshot '{args.from_snapshot}', expected 'latest' or one of {snapshot_names}")
+
+        if args.from_snapshot == "latest" and snapshots.latest() is None:
+            parser.error(f"there are only subset snapshots in '{snapshots.directory}', one of them must be named")
+
+    templates = {}
+    for template in args.templates:
+        target, _, template_path = template.partition("=")
+        if target not in CONVERTERS or not template_path:
+            parser.error(f"invalid template '{template}', expected TARGET=PATH with TARGET one of {list(CONVERTERS)}")
+
+        templates[target] = template_path
+
+    try:
+        selection = create_selection(args.include, args.exclude)
+
+    except ValueError as e:
+        parser.error(str(e))
+
+    sink = None
+    if args.output_archive:
+        try:
+            sink = archive_sink(args.output_archive)
+
+        except ValueError as e:
+            parser.error(str(e))
+
+        if args.watch is not None:
+            parser.error("--output-archive can not be used together with --watch")
+
+    shard = None
+    if args.shard:
+        try:
+            shard = Shard.parse(args.shard)
+
+        except ValueError as e:
+            parser.error(str(e))
+
+        if args.watch is not None:
+            parser.error("--shard can not be used together with --watch")
+
+    if args.merge_shards and (shard or args.watch is not None):
+        parser.error("--merge-shards can not be used together with --shard or --watch")
+
+    if args.profile:
+        profiler.enable(pstats_dir=args.profile_pstats)
+
+    if args.merge_shards:
+        merge_shards(args.merge_shards, sink or DirectorySink(), update_copyright_year=args.update_copyright_year,
+                     workers=args.generate_workers)
+
+    elif args.watch is not None:
+        watcher = Watcher(interval=args.watch, workers=args.workers, cache=download_cache, parser=args.parser,
+                          parse_workers=args.parse_workers, update_copyright_year=args.update_copyright_year,
+                          generate_workers=args.generate_workers, targets=args.targets or ["php"],
+                          templates=templates, scheduler=scheduler, selection=selection)
+        watcher.run()
+
+    else:
+        docs_parser.run(run_download=args.download, download_workers=args.workers, download_cache=download_cache,
+                        parser=args.parser, parse_workers=args.parse_workers, parse_cache=parse_cache,
+                        update_copyright_year=args.update_copyright_year, generate_workers=args.generate_workers,
+                        ir_input=args.from_ir, ir_output=args.dump_ir, targets=args.targets or ["php"],
+                        stream=args.stream, templates=templates, diff_from=args.diff_from,
+                        diff_report=args.diff_report, diff_only=args.diff_only, snapshots=snapshots,
+                        snapshot=args.from_snapshot, scheduler=scheduler, sink=sink, shard=shard,
+                        selection=selection)
+
+    if args.snapshot_keep is not None:
+        SnapshotStore().prune(args.snapshot_keep)
+
+    if args.profile:
+        profiler.write_report(args.profile_report)
@@ -1,7 +1,13 @@
 from .base import ConverterBase
 from .php_class_converter import PHPClassConverter
+from .source_index import SourceIndex
+from .template import Template
+from .typescript_interface_converter import TypeScriptInterfaceConverter
 
 __all__ = [
     "ConverterBase",
     "PHPClassConverter",
+    "SourceIndex",
+    "Template",
+    "TypeScriptInterfaceConverter",
 ]
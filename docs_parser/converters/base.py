@@ -1,12 +1,68 @@
 import abc
 
+from .source_index import SourceIndex
+from .template import Template
 from ..objects import ObjectDefinition, Resource, Operation
 
 
 class ConverterBase(metaclass=abc.ABCMeta):
 
+    # built-in template of the converter's output files and placeholders the converter provides values for
+    default_template_path: str | None = None
+    template_placeholders: set[str] = set()
+
     def __init__(self, resources: list[Resource]):
         self._resources = resources
+        self._index: SourceIndex | None = None
+        self._template: Template | None = None
+
+        self.output_dir: str = ""
+        self.nullable_fields: set[str] = set()
+        self.template_path: str | None = None
+
+    @property
+    def index(self) -> SourceIndex:
+        if self._index is None:
+            self._index = SourceIndex(self._resources)
+
+        return self._index
+
+    @property
+    def template(self) -> Template:
+        if self._template is None:
+            self._template = self.load_template()
+
+        return self._template
+
+    def template_constants(self) -> dict[str, str]:
+        """
+        Returns values of placeholders which do not change during the run, these are folded into the compiled template.
+        """
+        return {}
+
+    def load_template(self) -> Template:
+        filepath = self.template_path or self.default_template_path
+        if filepath is None:
+            raise ValueError(f"{type(self).__name__} does not support templates")
+
+        return Template.load(filepath, self.template_constants(), self.template_placeholders)
+
+    def prepare(self, objects: list[ObjectDefinition], index: SourceIndex = None):
+        """
+        Precomputes whatever the converter needs for rendering of the given objects, called once per run.
+        The source index is shared by all converters of the run, a new one is built when none is given.
+        """
+        if index is None:
+            index = SourceIndex(self._resources)
+            index.build(objects)
+
+        self._index = index
+        if self.template_path or self.default_template_path:
+            self._template = self.load_template()
+
+    @abc.abstractmethod
+    def packages(self, obj: ObjectDefinition) -> set[tuple[str, Operation]]:
+        pass
 
     @abc.abstractmethod
     def dirname(self, op: Operation) -> str:
@@ -19,3 +75,10 @@ class ConverterBase(metaclass=abc.ABCMeta):
     @abc.abstractmethod
     def contents(self, obj: ObjectDefinition, op: Operation) -> str:
         pass
+
+    def stable_contents(self, contents: str) -> str:
+        """
+        Returns the contents without the parts which change even though the definition itself
+        did not change (e.g. the copyright year). Files whose stable contents did not change are not rewritten.
+        """
+        return contents
@@ -1,9 +1,10 @@
 import datetime
 import logging
-from itertools import chain
+import os
+import re
 
 from .base import ConverterBase
-from ..objects import ObjectDefinition, Resource, ObjectProperty, Operation
+from ..objects import ObjectDefinition, Resource, ObjectProperty, Operation, TypeExpression
 
 log = logging.getLogger("php_class_converter")
 
@@ -11,35 +12,23 @@ log = logging.getLogger("php_class_converter")
 class PHPClassConverter(ConverterBase):
 
     standard_data_types = {"integer", "string", "bool", "float", "array"}
+    copyright_year_pattern = re.compile(r"(Copyright \(C\) \d{4}-)\d{4}")
+
+    default_template_path = os.path.join(os.path.dirname(__file__), "templates", "php_class.php.tpl")
+    template_placeholders = {"year", "package", "uses", "class_name", "annotation", "extends", "properties"}
 
     def __init__(self, resources: list[Resource]):
         super().__init__(resources)
 
-        self.output_dir: str = ""
-        self.nullable_fields: set[str] = set()
         self.iterable_classes: dict[str, str] = {}
         self.linkable_classes: dict[str, tuple[str, str]] = {}
 
-    def _get_package_name(self, op: Operation) -> str:
-        _, api_path_base, _ = op.api_path.split("/", maxsplit=2)
-        if api_path_base == "lol":
-            api_class = "LeagueAPI"
-
-        elif api_path_base == "lor":
-            api_class = "RuneterraAPI"
-
-        elif api_path_base == "val":
-            api_class = "ValorantAPI"
-
-        elif api_path_base == "tft":
-            api_class = "TFTAPI"
-
-        elif api_path_base == "riot":
-            api_class = "RiotAPI"
+        self._property_descriptions: dict[str, list[str]] = {}
 
-        else:
-            api_class = "_UNKNOWN_"
+    def _get_package_name(self, op: Operation) -> str:
+        return self._get_api_class_package_name(self.index.api_class(op))
 
+    def _get_api_class_package_name(self, api_class: str) -> str:
         return f"RiotAPI\\{api_class}\\Objects"
 
     def _get_uses(self, obj: ObjectDefinition) -> str:
@@ -88,14 +77,20 @@ class PHPClassConverter(ConverterBase):
         return " extends ApiObject"
 
     def _get_class_property_description(self, prop: ObjectProperty) -> list[str]:
+        if (description := self._property_descriptions.get(prop.description)) is None:
+            description = self._property_descriptions[prop.description] = self._wrap_description(prop.description)
+
+        return description
+
+    def _wrap_description(self, text: str) -> list[str]:
         description = []
-        if len(prop.description):
-            if not prop.description.endswith("."):
-                prop.description += "."
+        if len(text):
+            if not text.endswith("."):
+                text += "."
 
             desc_line = []
             char_count = 8
-            desc_split = prop.description.split()
+            desc_split = text.split()
             for _id, word in enumerate(desc_split):
                 char_count += len(word) + 1
                 if char_count > 80:
@@ -114,36 +109,24 @@ class PHPClassConverter(ConverterBase):
 
     def _get_class_used_by(self, obj: ObjectDefinition, op: Operation) -> list[str]:
         lines = [" Used in:"]
-        _, class_name, _ = self._get_package_name(op).split("\\")
+        class_name = self.index.api_class(op)
 
-        for resource, operations in obj.sources.items():
-            operations_lines = []
+        for resource, operations in self.index.object_sources(obj).get(class_name, []):
+            lines.append(f"   {resource.as_source}")
             for operation in operations:
-                if self._get_package_name(operation) != self._get_package_name(op):
-                    continue
-
-                operations_lines.extend([
+                lines.extend([
                     f"     - @see {class_name}::{operation.id}",
                     f"       @link {operation.docs_link}",
                 ])
 
-            if operations_lines:
-                lines.append(f"   {resource.as_source}")
-                lines.extend(operations_lines)
-
         return lines
 
-    def _get_class_property_used_by(self, prop: ObjectProperty, op: Operation) -> list[str]:
-        lines = []
-        _, class_name, _ = self._get_package_name(op).split("\\")
-
-        for resource, operations in prop.sources.items():
-            for operation in operations:
-                if self._get_package_name(operation) != self._get_package_name(op):
-                    continue
-
-                lines.append(f" *   - @see {class_name}::{operation.id}")
-
+    def _get_class_property_used_by(self, obj: ObjectDefinition, prop: ObjectProperty, op: Operation) -> list[str]:
+        class_name = self.index.api_class(op)
+        lines = [
+            f" *   - @see {class_name}::{operation.id}"
+            for operation in self.index.property_sources(obj, prop).get(class_name, [])
+        ]
         if not lines:
             return []
 
@@ -156,10 +139,7 @@ class PHPClassConverter(ConverterBase):
         return " = null" if self._is_prop_nullable(obj, prop) else ""
 
     def _get_class_property_type(self, obj: ObjectDefinition, prop: ObjectProperty) -> str:
-        datatype = self._get_php_datatype(prop.type)
-        if prop.is_array:
-            datatype = f"array"
-
+        datatype = self._get_php_datatype(prop.type_expression)
         if self._is_prop_nullable(obj, prop):
             if datatype in self.standard_data_types:
                 datatype += "|null"
@@ -170,33 +150,31 @@ class PHPClassConverter(ConverterBase):
         return datatype
 
     def _get_class_property_phpdoc_type(self, obj: ObjectDefinition, prop: ObjectProperty) -> str:
-        datatype = self._get_php_datatype(prop.type)
-        if prop.is_array:
-            datatype = datatype + f"[]"
-
+        datatype = self._get_phpdoc_datatype(prop.type_expression)
         if self._is_prop_nullable(obj, prop):
             datatype += "|null"
 
         return datatype
 
-    def _get_php_datatype(self, type_name: str) -> str:
-        if type_name.lower() in ["float", "double"]:
-            return "float"
+    def _get_php_datatype(self, expression: TypeExpression) -> str:
+        # lists, sets and maps are all PHP arrays, types of their elements are only described by the phpdoc
+        if expression.is_container:
+            return "array"
 
-        if type_name.lower() in ["int", "long"]:
-            return "int"
+        return expression.name
 
-        if type_name.lower() in ["bool", "boolean"]:
-            return "bool"
+    def _get_phpdoc_datatype(self, expression: TypeExpression) -> str:
+        if expression.is_container:
+            return self._get_phpdoc_datatype(expression.element) + "[]"
 
-        return type_name
+        return expression.name
 
     def _get_class_properties(self, obj: ObjectDefinition, op: Operation) -> str:
         prop_strings = []
 
         for prop in obj.properties.values():
             description = self._get_class_property_description(prop)
-            used_by = self._get_class_property_used_by(prop, op)
+            used_by = self._get_class_property_used_by(obj, prop, op)
             if not used_by:
                 continue
 
@@ -221,51 +199,29 @@ class PHPClassConverter(ConverterBase):
         return "\n\t" + "\n\t".join(prop_strings)
 
     def packages(self, obj: ObjectDefinition) -> set[tuple[str, Operation]]:
-        packages: dict[str, Operation] = {}
-        for op in chain(*obj.sources.values()):
-            package_name = self._get_package_name(op)
-            if package_name not in packages:
-                packages[package_name] = op
-
-        return set(tuple(packages.items()))
+        return {
+            (self._get_api_class_package_name(api_class), resource_groups[0][1][0])
+            for api_class, resource_groups in self.index.object_sources(obj).items()
+        }
 
     def dirname(self, op: Operation) -> str:
-        _, name, _ = self._get_package_name(op).split("\\")
-        return f"{self.output_dir}/{name}"
+        return f"{self.output_dir}/{self.index.api_class(op)}"
 
     def filename(self, obj: ObjectDefinition) -> str:
         return f"{self._get_class_name(obj)}.php"
 
-    def contents(self, obj: ObjectDefinition, op: Operation) -> str:
-        return f'''
-<?php
-
-/**
- * Copyright (C) 2016-{datetime.datetime.now().year}  Daniel Dolejška
- *
- * This program is free software: you can redistribute it and/or modify
- * it under the terms of the GNU General Public License as published by
- * the Free Software Foundation, either version 3 of the License, or
- * (at your option) any later version.
- *
- * This program is distributed in the hope that it will be useful,
- * but WITHOUT ANY WARRANTY; without even the implied warranty of
- * MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
- * GNU General Public License for more details.
- *
- * You should have received a copy of the GNU General Public License
- * along with this program.  If not, see <http://www.gnu.org/licenses/>.
- */
-
-namespace {self._get_package_name(op)};
-{self._get_uses(obj)}
-
-/**
- *   Class {self._get_class_name(obj)}
- *{self._get_class_annotation(obj, op)}
- *
- * @package {self._get_package_name(op)}
- */
-class {self._get_class_name(obj)}{self._get_class_extends(obj)}
-''' + "{" + self._get_class_properties(obj, op) + "}\n"
+    def stable_contents(self, contents: str) -> str:
+        return self.copyright_year_pattern.sub(r"\1YYYY", contents, count=1)
 
+    def template_constants(self) -> dict[str, str]:
+        return {"year": str(datetime.datetime.now().year)}
+
+    def contents(self, obj: ObjectDefinition, op: Operation) -> str:
+        return self.template.render({
+            "package": self._get_package_name(op),
+            "uses": self._get_uses(obj),
+            "class_name": self._get_class_name(obj),
+            "annotation": self._get_class_annotation(obj, op),
+            "extends": self._get_class_extends(obj),
+            "properties": self._get_class_properties(obj, op),
+        })
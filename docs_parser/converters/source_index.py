@@ -0,0 +1,83 @@
+from itertools import chain
+
+from ..objects import ObjectDefinition, Resource, ObjectProperty, Operation, Sources
+
+API_CLASSES = {
+    "lol": "LeagueAPI",
+    "lor": "RuneterraAPI",
+    "val": "ValorantAPI",
+    "tft": "TFTAPI",
+    "riot": "RiotAPI",
+}
+UNKNOWN_API_CLASS = "_UNKNOWN_"
+
+
+class SourceIndex:
+    """
+    Target-independent precomputation shared by all converters of a run.
+
+    Resolves the API class (e.g. `LeagueAPI`) of each operation, groups the sources of every object
+    and property by API class in the order of the docs.
+    Everything is computed once and memoized, `build` precomputes it for all objects in a single pass.
+    """
+
+    def __init__(self, resources: list[Resource]):
+        # operations are listed in the order of the docs, not in the arbitrary order of the source sets,
+        # they are looked up by identity which is much cheaper than hashing the dataclass
+        self._operation_order: dict[int, int] = {
+            id(operation): index
+            for resource in resources
+            for index, operation in enumerate(resource.operations)
+        }
+        self._api_classes: dict[str, str] = {}
+        self._object_sources: dict[str, dict[str, list[tuple[Resource, list[Operation]]]]] = {}
+        self._property_sources: dict[tuple[str, str], dict[str, list[Operation]]] = {}
+
+    def build(self, objects: list[ObjectDefinition]):
+        self._object_sources.clear()
+        self._property_sources.clear()
+        for obj in objects:
+            self.object_sources(obj)
+            for prop in obj.properties.values():
+                self.property_sources(obj, prop)
+
+    def api_class(self, op: Operation) -> str:
+        if (api_class := self._api_classes.get(op.api_path)) is None:
+            _, api_path_base, _ = op.api_path.split("/", maxsplit=2)
+            api_class = self._api_classes[op.api_path] = API_CLASSES.get(api_path_base, UNKNOWN_API_CLASS)
+
+        return api_class
+
+    def ordered_operations(self, resource: Resource, operations: set[Operation]) -> list[Operation]:
+        order = self._operation_order
+        return sorted(operations, key=lambda operation: order.get(id(operation), len(resource.operations)))
+
+    def _group_sources(self, sources: Sources) -> dict[str, list[tuple[Resource, list[Operation]]]]:
+        grouped: dict[str, list[tuple[Resource, list[Operation]]]] = {}
+        for resource, operations in sources.items():
+            resource_groups: dict[str, list[Operation]] = {}
+            for operation in self.ordered_operations(resource, operations):
+                resource_groups.setdefault(self.api_class(operation), []).append(operation)
+
+            for api_class, api_class_operations in resource_groups.items():
+                grouped.setdefault(api_class, []).append((resource, api_class_operations))
+
+        return grouped
+
+    def object_sources(self, obj: ObjectDefinition) -> dict[str, list[tuple[Resource, list[Operation]]]]:
+        """Sources of the object grouped by API class and then by resource."""
+        if (grouped := self._object_sources.get(obj.name)) is None:
+            grouped = self._object_sources[obj.name] = self._group_sources(obj.sources)
+
+        return grouped
+
+    def property_sources(self, obj: ObjectDefinition, prop: ObjectProperty) -> dict[str, list[Operation]]:
+        """Source operations of the property grouped by API class."""
+        key = obj.name, prop.name
+        if (grouped := self._property_sources.get(key)) is None:
+            grouped = self._property_sources[key] = {
+                api_class: list(chain(*(operations for _, operations in resource_groups)))
+                for api_class, resource_groups in self._group_sources(prop.sources).items()
+            }
+
+        return grouped
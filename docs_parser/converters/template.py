@@ -0,0 +1,73 @@
+import logging
+import re
+
+log = logging.getLogger("template")
+
+
+class Template:
+    """
+    Output file template with `{{ name }}` placeholders. The template is compiled once into alternating literal
+    and placeholder parts, placeholders whose values are known at compile time (constants) are folded
+    into the surrounding literals. Rendering then only joins the parts in a reused buffer.
+    """
+
+    placeholder_pattern = re.compile(r"\{\{\s*(\w+)\s*\}\}")
+
+    def __init__(self, source: str, constants: dict[str, str] = None, placeholders: set[str] = None):
+        self.source = source
+        self.constants = constants or {}
+
+        self._literals: list[str] = []
+        self._names: list[str] = []
+        self._buffer: list[str] = []
+        self._compile(placeholders)
+
+    @classmethod
+    def load(cls, filepath: str, constants: dict[str, str] = None, placeholders: set[str] = None) -> "Template":
+        log.debug("loading template %s", filepath)
+        with open(filepath, "r", encoding="utf-8", newline="") as fd:
+            return cls(fd.read(), constants, placeholders)
+
+    @property
+    def placeholders(self) -> set[str]:
+        return set(self._names)
+
+    def _compile(self, placeholders: set[str] = None):
+        literal = []
+        position = 0
+        for match in self.placeholder_pattern.finditer(self.source):
+            literal.append(self.source[position:match.start()])
+            position = match.end()
+
+            name = match.group(1)
+            if name in self.constants:
+                literal.append(self.constants[name])
+                continue
+
+            if placeholders is not None and name not in placeholders:
+                raise ValueError(f"unknown template placeholder '{name}', available: {sorted(placeholders)}")
+
+            self._literals.append("".join(literal))
+            self._names.append(name)
+            literal = []
+
+        literal.append(self.source[position:])
+        self._literals.append("".join(literal))
+
+    def render(self, values: dict[str, str]) -> str:
+        buffer = self._buffer
+        buffer.clear()
+        for literal, name in zip(self._literals, self._names):
+            buffer.append(literal)
+            buffer.append(values[name])
+
+        buffer.append(self._literals[-1])
+        return "".join(buffer)
+
+    def __getstate__(self):
+        # the buffer is not worth sending to the rendering processes
+        return self.source, self.constants, self._literals, self._names
+
+    def __setstate__(self, state):
+        self.source, self.constants, self._literals, self._names = state
+        self._buffer = []
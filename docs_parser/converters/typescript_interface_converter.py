@@ -0,0 +1,133 @@
+import logging
+
+from .base import ConverterBase
+from .source_index import SourceIndex
+from ..objects import ObjectDefinition, Resource, ObjectProperty, Operation, TypeExpression
+
+log = logging.getLogger("typescript_interface_converter")
+
+
+class TypeScriptInterfaceConverter(ConverterBase):
+
+    primitive_data_types = {
+        "int": "number",
+        "float": "number",
+        "bool": "boolean",
+        "string": "string",
+    }
+
+    def __init__(self, resources: list[Resource]):
+        super().__init__(resources)
+
+        self._object_api_classes: dict[str, list[str]] = {}
+
+    def prepare(self, objects: list[ObjectDefinition], index: SourceIndex = None):
+        super().prepare(objects, index)
+        # referenced interfaces are imported from the same API class when available, otherwise from the first one
+        self._object_api_classes = {
+            obj.name: list(self.index.object_sources(obj))
+            for obj in objects
+        }
+
+    def _get_interface_name(self, obj: ObjectDefinition) -> str:
+        return obj.name
+
+    def _get_datatype(self, expression: TypeExpression) -> str:
+        if expression.kind == "primitive":
+            return self.primitive_data_types[expression.name.lower()]
+
+        if expression.kind == "reference":
+            # object names are normalized the same way by the parser
+            return expression.name.replace("DTO", "Dto")
+
+        if expression.kind == "map":
+            key = self._get_datatype(expression.arguments[0]) if len(expression.arguments) > 1 else "string"
+            if key not in ("string", "number"):
+                key = "string"
+
+            return f"Record<{key}, {self._get_datatype(expression.element)}>"
+
+        return f"{self._get_datatype(expression.element)}[]"
+
+    def _is_prop_nullable(self, obj: ObjectDefinition, prop: ObjectProperty) -> bool:
+        return f"{obj.name}.{prop.name}" in self.nullable_fields
+
+    def _get_property_type(self, obj: ObjectDefinition, prop: ObjectProperty) -> str:
+        datatype = self._get_datatype(prop.type_expression)
+        if self._is_prop_nullable(obj, prop):
+            datatype += " | null"
+
+        return datatype
+
+    def _get_imports(self, obj: ObjectDefinition, api_class: str) -> list[str]:
+        imports = []
+        referenced = {
+            type_name.replace("DTO", "Dto")
+            for prop in obj.properties.values()
+            for type_name in prop.type_expression.references()
+        }
+        for type_name in sorted(referenced):
+            if type_name == obj.name or (type_api_classes := self._object_api_classes.get(type_name)) is None:
+                continue
+
+            if api_class in type_api_classes:
+                imports.append(f'import type {{ {type_name} }} from "./{type_name}";')
+
+            else:
+                imports.append(f'import type {{ {type_name} }} from "../{type_api_classes[0]}/{type_name}";')
+
+        return imports
+
+    def _get_used_by(self, obj: ObjectDefinition, api_class: str) -> list[str]:
+        lines = [" * Used in:"]
+        for resource, operations in self.index.object_sources(obj).get(api_class, []):
+            lines.append(f" *   {resource.as_source}")
+            lines.extend(f" *     - {operation.id} {operation.docs_link}" for operation in operations)
+
+        return lines
+
+    def _get_properties(self, obj: ObjectDefinition, api_class: str) -> list[str]:
+        lines = []
+        for prop in obj.properties.values():
+            if api_class not in self.index.property_sources(obj, prop):
+                continue
+
+            if prop.description:
+                description = prop.description.replace("*/", "*\\/")
+                lines.append(f"\t/** {description} */")
+
+            optional = "?" if self._is_prop_nullable(obj, prop) else ""
+            lines.append(f"\t{prop.name}{optional}: {self._get_property_type(obj, prop)};")
+
+        return lines
+
+    def packages(self, obj: ObjectDefinition) -> set[tuple[str, Operation]]:
+        return {
+            (api_class, resource_groups[0][1][0])
+            for api_class, resource_groups in self.index.object_sources(obj).items()
+        }
+
+    def dirname(self, op: Operation) -> str:
+        return f"{self.output_dir}/{self.index.api_class(op)}"
+
+    def filename(self, obj: ObjectDefinition) -> str:
+        return f"{self._get_interface_name(obj)}.ts"
+
+    def contents(self, obj: ObjectDefinition, op: Operation) -> str:
+        api_class = self.index.api_class(op)
+        lines = self._get_imports(obj, api_class)
+        if lines:
+            lines.append("")
+
+        lines.extend([
+            "/**",
+            f" * Interface {self._get_interface_name(obj)}",
+            " *",
+            *self._get_used_by(obj, api_class),
+            " */",
+            f"export interface {self._get_interface_name(obj)} {{",
+            *self._get_properties(obj, api_class),
+            "}",
+            "",
+        ])
+        return "\n".join(lines)
@@ -0,0 +1,249 @@
+import logging
+from dataclasses import dataclass, field
+from typing import Callable
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+
+log = logging.getLogger("docs_parser.extraction")
+
+
+@dataclass(slots=True)
+class BodyRecord:
+    """Raw data of a response body, heading and property rows are extracted only for object definitions."""
+
+    element: Tag
+    text: str = ""
+    heading: str | None = None
+    rows: list[list[str]] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class OperationRecord:
+    link: str | None = None
+    path: str | None = None
+    bodies: list[BodyRecord] = field(default_factory=list)
+
+
+@dataclass(slots=True)
+class ResourceRecord:
+    """Raw data of a resource extracted from a parsed document, see `EXTRACTORS`."""
+
+    element: Tag
+    link: str | None = None
+    operations: list[OperationRecord] = field(default_factory=list)
+
+
+def extract_select(soup: BeautifulSoup, selects: Callable[[Tag], bool] = None) -> list[ResourceRecord]:
+    """
+    Extracts the raw resource data by CSS selects, every select walks the subtree of its element again.
+    Resource elements for which `selects` returns false are skipped.
+    """
+    resources = []
+    for resource_data in soup.select(".resource"):
+        if selects is not None and not selects(resource_data):
+            continue
+
+        resource = ResourceRecord(resource_data, resource_data.find("a")["href"])
+        for operation_data in resource_data.select(".operation"):
+            operation = OperationRecord(operation_data.find("a")["href"], operation_data.select_one("span.path").text)
+            for object_data in operation_data.select(".response_body"):
+                body = BodyRecord(object_data, object_data.text)
+                if "Return value:" not in body.text:
+                    if (object_heading := object_data.select_one("h5")) is None:
+                        object_heading = object_data.select_one("div > b")
+
+                    if object_heading is not None:
+                        body.heading = object_heading.text
+                        # lxml and html.parser do not insert the implicit tbody element like html5lib does
+                        body.rows = [
+                            [cell.text for cell in prop_entry.select("td")]
+                            for prop_entry in object_data.select("table > tbody tr, table > tr")
+                        ]
+
+                operation.bodies.append(body)
+
+            resource.operations.append(operation)
+
+        resources.append(resource)
+
+    return resources
+
+
+class _Text:
+    """Collects the text of an element the same way `Tag.text` does, while the element is being walked."""
+
+    __slots__ = ("types", "parts")
+
+    def __init__(self, element: Tag):
+        self.types = element.interesting_string_types or Tag.MAIN_CONTENT_STRING_TYPES
+        self.parts: list[str] = []
+
+    def add(self, string: NavigableString):
+        string_type = type(string)
+        if string_type is self.types if isinstance(self.types, type) else string_type in self.types:
+            self.parts.append(string)
+
+    def __str__(self) -> str:
+        return "".join(self.parts)
+
+
+class _BodyState:
+    __slots__ = ("record", "text", "h5", "b", "rows")
+
+    def __init__(self, element: Tag):
+        self.record = BodyRecord(element)
+        self.text = _Text(element)
+        self.h5: _Text | None = None
+        self.b: _Text | None = None
+        self.rows: list[list[_Text]] = []
+
+
+def extract_single_pass(soup: BeautifulSoup, selects: Callable[[Tag], bool] = None) -> list[ResourceRecord]:
+    """
+    Extracts the same raw resource data as `extract_select` by a single walk over the document,
+    dispatching on the tag names and classes of the elements. The text of each element is collected
+    while its strings are walked, so it is never computed more than once.
+    Subtrees of resource elements for which `selects` returns false are not walked at all.
+    """
+    resources: list[ResourceRecord] = []
+    resource: ResourceRecord | None = None
+    operation: OperationRecord | None = None
+    body: _BodyState | None = None
+    path: _Text | None = None
+    # texts collected at the moment, rows and cells currently being walked, depth of `table > tbody` elements
+    texts: list[_Text] = []
+    rows: list[list[_Text]] = []
+    table_bodies = 0
+
+    # elements are pushed together with their exit actions, which restore the state of the walk
+    stack: list = [(soup, None)]
+    while stack:
+        node, exit_action = stack.pop()
+        if exit_action is not None:
+            exit_action()
+            continue
+
+        if isinstance(node, NavigableString):
+            for text in texts:
+                text.add(node)
+
+            continue
+
+        if not isinstance(node, Tag):
+            continue
+
+        name = node.name
+        classes = node.get("class") or ()
+        actions = []
+
+        if "resource" in classes:
+            if selects is not None and not selects(node):
+                continue
+
+            previous = resource, operation, body
+
+            def exit_resource(previous=previous):
+                nonlocal resource, operation, body
+                resource, operation, body = previous
+
+            resource, operation, body = ResourceRecord(node), None, None
+            resources.append(resource)
+            actions.append(exit_resource)
+
+        if resource is not None and "operation" in classes:
+            previous = operation, body
+
+            def exit_operation(previous=previous):
+                nonlocal operation, body
+                operation, body = previous
+
+            operation, body = OperationRecord(), None
+            resource.operations.append(operation)
+            actions.append(exit_operation)
+
+        if operation is not None and "response_body" in classes:
+            def exit_body(previous=body):
+                nonlocal body
+                state = body
+                record = state.record
+                texts.remove(state.text)
+                record.text = str(state.text)
+                if "Return value:" not in record.text:
+                    heading = state.h5 if state.h5 is not None else state.b
+                    if heading is not None:
+                        record.heading = str(heading)
+                        record.rows = [[str(cell) for cell in row] for row in state.rows]
+
+                body = previous
+
+            body = _BodyState(node)
+            operation.bodies.append(body.record)
+            texts.append(body.text)
+            actions.append(exit_body)
+
+        if name == "a":
+            if resource is not None and resource.link is None:
+                resource.link = node["href"]
+
+            if operation is not None and operation.link is None:
+                operation.link = node["href"]
+
+        elif name == "span" and operation is not None and operation.path is None and path is None \
+                and "path" in classes:
+            path = _Text(node)
+            texts.append(path)
+
+            def exit_path(current=operation):
+                nonlocal path
+                texts.remove(path)
+                current.path = str(path)
+                path = None
+
+            actions.append(exit_path)
+
+        elif body is not None and name == "h5" and body.h5 is None:
+            body.h5 = _Text(node)
+            texts.append(body.h5)
+            actions.append(lambda text=body.h5: texts.remove(text))
+
+        elif body is not None and name == "b" and body.b is None and node.parent is not None \
+                and node.parent.name == "div":
+            body.b = _Text(node)
+            texts.append(body.b)
+            actions.append(lambda text=body.b: texts.remove(text))
+
+        elif name == "tbody" and node.parent is not None and node.parent.name == "table":
+            table_bodies += 1
+
+            def exit_table_body():
+                nonlocal table_bodies
+                table_bodies -= 1
+
+            actions.append(exit_table_body)
+
+        elif name == "tr" and body is not None and (table_bodies or node.parent.name == "table"):
+            row: list[_Text] = []
+            body.rows.append(row)
+            rows.append(row)
+            actions.append(lambda: rows.pop())
+
+        elif name == "td" and rows:
+            for row in rows:
+                cell = _Text(node)
+                row.append(cell)
+                texts.append(cell)
+                actions.append(lambda text=cell: texts.remove(text))
+
+        # exit actions run in the reverse order of their registration, after all the children are walked
+        for action in actions:
+            stack.append((None, action))
+
+        stack.extend((child, None) for child in reversed(node.contents))
+
+    return resources
+
+
+EXTRACTORS = {
+    "single-pass": extract_single_pass,
+    "select": extract_select,
+}
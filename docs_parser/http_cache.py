@@ -0,0 +1,120 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter
+
+import requests
+
+log = logging.getLogger("docs_parser.http_cache")
+
+
+class HttpCache:
+    """
+    On-disk cache of downloaded pages keyed by name (e.g. API name).
+
+    Each entry stores the response body together with its `ETag` and `Last-Modified` validators.
+    Entries younger than `max_age` seconds are used without contacting the server at all, older
+    entries are revalidated by a conditional request and reused on `304 Not Modified`.
+    Once the cache grows over `max_size` bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: str = "cache/http", max_age: float = 0, max_size: int = None):
+        self.directory = directory
+        self.max_age = max_age
+        self.max_size = max_size
+        self.stats = Counter()
+        self._lock = threading.Lock()
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _filepath(self, key: str) -> str:
+        return f"{self.directory}/{key}.json"
+
+    def _count(self, stat: str):
+        with self._lock:
+            self.stats[stat] += 1
+
+    def load(self, key: str) -> dict | None:
+        try:
+            with open(self._filepath(key), "r", encoding="utf-8") as fd:
+                return json.load(fd)
+
+        except FileNotFoundError:
+            return None
+
+        except ValueError:
+            log.warning("discarding corrupted cache entry %s", key)
+            return None
+
+    def store(self, key: str, entry: dict):
+        filepath = self._filepath(key)
+        with open(f"{filepath}.tmp", "w", encoding="utf-8") as fd:
+            json.dump(entry, fd)
+
+        os.replace(f"{filepath}.tmp", filepath)
+
+    def fetch(self, s: requests.Session, key: str, url: str) -> tuple[str, int]:
+        """Returns the response body and the number of its bytes received, bodies served from the cache are not."""
+        entry = self.load(key)
+        if entry is not None and entry["url"] != url:
+            entry = None
+
+        now = time.time()
+        if entry is not None and now - entry["stored_at"] < self.max_age:
+            log.debug("using fresh cache entry %s", key)
+            self._count("fresh")
+            os.utime(self._filepath(key))
+            return entry["body"], 0
+
+        headers = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+        r = s.get(url, headers=headers)
+        if r.status_code == 304 and entry is not None:
+            log.debug("cache entry %s has not been modified", key)
+            self._count("revalidated")
+            entry["stored_at"] = now
+            self.store(key, entry)
+            return entry["body"], 0
+
+        r.raise_for_status()
+        log.debug("storing cache entry %s", key)
+        self._count("miss")
+        self.store(key, {
+            "url": url,
+            "etag": r.headers.get("ETag"),
+            "last_modified": r.headers.get("Last-Modified"),
+            "stored_at": now,
+            "body": r.text,
+        })
+        return r.text, len(r.content)
+
+    def prune(self):
+        if self.max_size is None:
+            return
+
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not filename.endswith(".json"):
+                continue
+
+            stat = os.stat(f"{self.directory}/{filename}")
+            entries.append((stat.st_mtime, stat.st_size, filename))
+
+        total_size = sum(size for _, size, _ in entries)
+        # the least recently used entries go first
+        for _, size, filename in sorted(entries):
+            if total_size <= self.max_size:
+                break
+
+            log.debug("evicting cache entry %s", filename)
+            os.remove(f"{self.directory}/{filename}")
+            total_size -= size
+            self._count("evicted")
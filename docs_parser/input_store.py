@@ -0,0 +1,84 @@
+import json
+import logging
+import os
+from typing import Iterator
+
+log = logging.getLogger("docs_parser.input_store")
+
+
+class InputStore:
+    """
+    Sharded storage of downloaded API details, one HTML file per API plus a manifest listing
+    the APIs in their landing page order.
+
+        input/shards/manifest.json
+        input/shards/{api_name}.html
+
+    Inputs downloaded before the sharded layout was introduced (single `input/input.html`)
+    are still loaded when no manifest is present.
+    """
+
+    legacy_filename = "input.html"
+    manifest_filename = "manifest.json"
+
+    def __init__(self, directory: str = "input"):
+        self.directory = directory
+        self.shards_directory = f"{directory}/shards"
+
+    @property
+    def manifest_filepath(self) -> str:
+        return f"{self.shards_directory}/{self.manifest_filename}"
+
+    @property
+    def legacy_filepath(self) -> str:
+        return f"{self.directory}/{self.legacy_filename}"
+
+    def shard_filepath(self, api_name: str) -> str:
+        return f"{self.shards_directory}/{api_name}.html"
+
+    def write_shard(self, api_name: str, html: str):
+        os.makedirs(self.shards_directory, exist_ok=True)
+        filepath = self.shard_filepath(api_name)
+        log.debug("writing API details of %s to '%s'", api_name, filepath)
+        with open(f"{filepath}.tmp", "wb") as fd:
+            fd.write(html.encode("utf-8"))
+
+        os.replace(f"{filepath}.tmp", filepath)
+
+    def write_manifest(self, api_names: list[str]):
+        os.makedirs(self.shards_directory, exist_ok=True)
+        log.debug("writing input manifest to '%s'", self.manifest_filepath)
+        with open(f"{self.manifest_filepath}.tmp", "w", encoding="utf-8") as fd:
+            json.dump({"apis": api_names}, fd, indent=2)
+
+        os.replace(f"{self.manifest_filepath}.tmp", self.manifest_filepath)
+
+        # shards of APIs which are no longer listed would be picked up by nothing, remove them
+        listed = {f"{api_name}.html" for api_name in api_names}
+        for filename in os.listdir(self.shards_directory):
+            if filename.endswith(".html") and filename not in listed:
+                log.debug("removing stale input shard '%s'", filename)
+                os.remove(f"{self.shards_directory}/{filename}")
+
+    def names(self) -> list[str]:
+        with open(self.manifest_filepath, "r", encoding="utf-8") as fd:
+            return json.load(fd)["apis"]
+
+    def has_shard(self, api_name: str) -> bool:
+        return os.path.isfile(self.shard_filepath(api_name))
+
+    def read_shard(self, api_name: str) -> str:
+        with open(self.shard_filepath(api_name), "r", encoding="utf-8") as fd:
+            return fd.read()
+
+    def __iter__(self) -> Iterator[str]:
+        if not os.path.isfile(self.manifest_filepath):
+            log.debug("loading docs sources from %s", self.legacy_filepath)
+            with open(self.legacy_filepath, "r", encoding="utf-8") as fd:
+                yield fd.read()
+
+            return
+
+        for api_name in self.names():
+            log.debug("loading docs sources of %s from %s", api_name, self.shard_filepath(api_name))
+            yield self.read_shard(api_name)
@@ -0,0 +1,114 @@
+import json
+import logging
+import sys
+
+from .objects import *
+
+log = logging.getLogger("docs_parser.ir")
+
+IR_VERSION = 2
+
+
+def _encode_sources(sources: Sources,
+                    operation_ids: dict[tuple[int, str, str], int]) -> list[int]:
+    return [
+        operation_id
+        for resource, operations in sources.items()
+        for operation_id in sorted(operation_ids[resource.id, operation.id, operation.method]
+                                   for operation in operations)
+    ]
+
+
+def to_ir(resources: list[Resource], objects: list[ObjectDefinition]) -> dict:
+    """
+    Converts the parse result into a JSON-serializable representation.
+
+    Operations are stored once in a table and the sources of objects and properties
+    reference them by their index in it.
+    """
+    operations = []
+    operation_ids: dict[tuple[int, str, str], int] = {}
+    ir_resources = []
+    for resource in resources:
+        resource_operation_ids = []
+        for operation in resource.operations:
+            operation_ids[resource.id, operation.id, operation.method] = len(operations)
+            resource_operation_ids.append(len(operations))
+            operations.append([operation.id, operation.method, operation.returns,
+                               operation.docs_link, operation.api_path])
+
+        ir_resources.append([resource.id, resource.name, resource.version, resource.api_link,
+                             resource_operation_ids])
+
+    ir_objects = [
+        [
+            obj.name,
+            obj.description,
+            _encode_sources(obj.sources, operation_ids),
+            [
+                [prop.name, prop.type, prop.description, _encode_sources(prop.sources, operation_ids)]
+                for prop in obj.properties.values()
+            ],
+        ]
+        for obj in objects
+    ]
+
+    return {
+        "version": IR_VERSION,
+        "resources": ir_resources,
+        "operations": operations,
+        "objects": ir_objects,
+    }
+
+
+def from_ir(ir: dict) -> tuple[list[Resource], list[ObjectDefinition]]:
+    if ir.get("version") != IR_VERSION:
+        raise ValueError(f"unsupported IR version {ir.get('version')}, expected {IR_VERSION}")
+
+    operations: list[Operation] = [
+        Operation(id=op_id, method=sys.intern(method), returns=returns, docs_link=docs_link, api_path=api_path)
+        for op_id, method, returns, docs_link, api_path in ir["operations"]
+    ]
+    operation_resources: list[Resource | None] = [None] * len(operations)
+    resources = []
+    for resource_id, name, version, api_link, operation_ids in ir["resources"]:
+        resource = Resource(id=resource_id, name=sys.intern(name), version=sys.intern(version), api_link=api_link,
+                            operations=[operations[operation_id] for operation_id in operation_ids])
+        for operation_id in operation_ids:
+            operation_resources[operation_id] = resource
+
+        resources.append(resource)
+
+    def decode_sources(operation_ids: list[int]) -> Sources:
+        return Sources([
+            (operation_resources[operation_id], operations[operation_id])
+            for operation_id in operation_ids
+        ])
+
+    objects = []
+    for name, description, sources, properties in ir["objects"]:
+        obj = ObjectDefinition(name=name, description=description, properties={},
+                               sources=decode_sources(sources))
+        for prop_name, prop_type, prop_description, prop_sources in properties:
+            obj.properties[prop_name] = ObjectProperty(
+                name=sys.intern(prop_name),
+                type=sys.intern(prop_type),
+                description=prop_description,
+                sources=decode_sources(prop_sources),
+            )
+
+        objects.append(obj)
+
+    return resources, objects
+
+
+def dump_ir(resources: list[Resource], objects: list[ObjectDefinition], filepath: str):
+    log.info("writing intermediate representation to %s", filepath)
+    with open(filepath, "w", encoding="utf-8") as fd:
+        json.dump(to_ir(resources, objects), fd, ensure_ascii=False, separators=(",", ":"))
+
+
+def load_ir(filepath: str) -> tuple[list[Resource], list[ObjectDefinition]]:
+    log.info("loading intermediate representation from %s", filepath)
+    with open(filepath, "r", encoding="utf-8") as fd:
+        return from_ir(json.load(fd))
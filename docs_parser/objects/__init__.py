@@ -2,10 +2,15 @@ from .operation import Operation
 from .object_definition import ObjectDefinition
 from .object_property import ObjectProperty
 from .resource import Resource
+from .sources import Sources
+from .type_expression import TypeExpression, parse_type
 
 __all__ = [
     "Operation",
     "ObjectDefinition",
     "ObjectProperty",
     "Resource",
+    "Sources",
+    "TypeExpression",
+    "parse_type",
 ]
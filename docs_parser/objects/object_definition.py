@@ -1,13 +1,12 @@
 from dataclasses import dataclass
 
-from .resource import Resource
-from .operation import Operation
 from .object_property import ObjectProperty
+from .sources import Sources
 
 
-@dataclass()
+@dataclass(slots=True)
 class ObjectDefinition:
     name: str
     description: str
     properties: dict[str, ObjectProperty]
-    sources: dict[Resource, set[Operation]]
+    sources: Sources
@@ -1,13 +1,20 @@
 from dataclasses import dataclass
 
-from .resource import Resource
-from .operation import Operation
+from .sources import Sources
+from .type_expression import TypeExpression, parse_type
 
 
-@dataclass()
+@dataclass(slots=True)
 class ObjectProperty:
     name: str
     type: str
     description: str
-    sources: dict[Resource, set[Operation]]
-    is_array: bool
+    sources: Sources
+
+    @property
+    def type_expression(self) -> TypeExpression:
+        return parse_type(self.type)
+
+    @property
+    def is_array(self) -> bool:
+        return self.type_expression.is_container
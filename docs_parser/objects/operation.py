@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
 
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class Operation:
     id: int
     method: str
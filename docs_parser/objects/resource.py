@@ -3,7 +3,7 @@ from dataclasses import dataclass, field
 from .operation import Operation
 
 
-@dataclass(unsafe_hash=True)
+@dataclass(unsafe_hash=True, slots=True)
 class Resource:
     id: int
     name: str = field(compare=False)
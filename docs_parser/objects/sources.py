@@ -0,0 +1,78 @@
+from collections.abc import Mapping
+from typing import Iterator
+
+from .operation import Operation
+from .resource import Resource
+
+
+def _operation_bit(resource: Resource, operation: Operation) -> int:
+    for position, resource_operation in enumerate(resource.operations):
+        if resource_operation is operation:
+            return 1 << position
+
+    raise ValueError(f"operation {operation.id} is not an operation of resource {resource.as_source}")
+
+
+class Sources(Mapping):
+    """
+    Read-only mapping of resources to the sets of their operations an object or property was received from.
+
+    Sources are stored as an insertion-ordered dict of resources to bitmasks of the positions of their operations
+    in `Resource.operations` instead of a dict of sets, new sources are added by `add` and `update`.
+    Nothing is shared between instances, so sources keep alive only the resources they reference.
+    """
+
+    __slots__ = ("_operations",)
+
+    def __init__(self, pairs: list[tuple[Resource, Operation]] = ()):
+        self._operations: dict[Resource, int] = {}
+        for resource, operation in pairs:
+            self.add(resource, operation)
+
+    def add(self, resource: Resource, operation: Operation):
+        self._operations[resource] = self._operations.get(resource, 0) | _operation_bit(resource, operation)
+
+    def update(self, other: "Sources"):
+        for resource, operations in other.items():
+            for operation in operations:
+                self.add(resource, operation)
+
+    def copy(self) -> "Sources":
+        sources = Sources()
+        sources._operations = self._operations.copy()
+        return sources
+
+    def pairs(self) -> Iterator[tuple[Resource, Operation]]:
+        for resource, bits in self._operations.items():
+            for position, operation in enumerate(resource.operations):
+                if bits >> position & 1:
+                    yield resource, operation
+
+    def __getitem__(self, resource: Resource) -> set[Operation]:
+        bits = self._operations[resource]
+        return {operation for position, operation in enumerate(resource.operations) if bits >> position & 1}
+
+    def __iter__(self) -> Iterator[Resource]:
+        return iter(self._operations)
+
+    def __len__(self) -> int:
+        return len(self._operations)
+
+    def items(self):
+        return [(resource, self[resource]) for resource in self._operations]
+
+    def values(self):
+        return [self[resource] for resource in self._operations]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Mapping):
+            return NotImplemented
+
+        return dict(self.items()) == dict(other.items())
+
+    def __repr__(self) -> str:
+        return f"Sources({dict(self.items())!r})"
+
+    def __reduce__(self):
+        # sources are transferred as resource-operation pairs, positions are resolved again on load
+        return Sources, (list(self.pairs()),)
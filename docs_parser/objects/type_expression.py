@@ -0,0 +1,100 @@
+import functools
+import sys
+from dataclasses import dataclass
+
+# numeric and boolean names are normalized, other primitives keep the name as written in the docs
+PRIMITIVE_TYPES = {
+    "int": "int",
+    "long": "int",
+    "float": "float",
+    "double": "float",
+    "bool": "bool",
+    "boolean": "bool",
+}
+VERBATIM_PRIMITIVE_TYPES = {"string"}
+CONTAINER_TYPES = {
+    "list": "list",
+    "array": "list",
+    "set": "set",
+    "map": "map",
+    "dict": "map",
+}
+
+
+@dataclass(frozen=True, slots=True)
+class TypeExpression:
+    """
+    Parsed property type, e.g. `Map[String, List[MatchDto]]`.
+
+    Kind is one of `primitive` (numeric and boolean names are normalized to int, float or bool, strings keep
+    their name), `reference` (name of the referenced object as written in the docs), `list`, `set` and `map`
+    (arguments are the element type, or the key and value types). Expressions are interned, see `parse_type`.
+    """
+
+    kind: str
+    name: str
+    arguments: tuple["TypeExpression", ...] = ()
+
+    @property
+    def is_container(self) -> bool:
+        return bool(self.arguments)
+
+    @property
+    def element(self) -> "TypeExpression":
+        """Type of the list and set elements and of the map values."""
+        return self.arguments[-1]
+
+    def references(self) -> set[str]:
+        if self.kind == "reference":
+            return {self.name}
+
+        return set().union(*(argument.references() for argument in self.arguments))
+
+    def __str__(self) -> str:
+        if not self.arguments:
+            return self.name
+
+        return f"{self.name}[{', '.join(map(str, self.arguments))}]"
+
+
+def _split_arguments(arguments: str) -> list[str]:
+    # splits on the top-level commas only, nested generics stay in one piece
+    parts, depth, start = [], 0, 0
+    for position, char in enumerate(arguments):
+        if char == "[":
+            depth += 1
+
+        elif char == "]":
+            depth -= 1
+
+        elif char == "," and depth == 0:
+            parts.append(arguments[start:position])
+            start = position + 1
+
+    parts.append(arguments[start:])
+    return parts
+
+
+@functools.cache
+def parse_type(raw_type: str) -> TypeExpression:
+    """
+    Parses the type string of a property. Each distinct string is parsed only once,
+    the same string (or subexpression) always results in the very same expression instance.
+    """
+    raw_type = raw_type.strip()
+    if raw_type.endswith("[]"):
+        return TypeExpression("list", "List", (parse_type(raw_type[:-2]),))
+
+    if raw_type.endswith("]") and (bracket := raw_type.find("[")) > 0:
+        name = raw_type[:bracket].strip()
+        arguments = tuple(parse_type(argument) for argument in _split_arguments(raw_type[bracket + 1:-1]))
+        # unknown generics are handled as lists of their last argument
+        return TypeExpression(CONTAINER_TYPES.get(name.lower(), "list"), sys.intern(name), arguments)
+
+    if (primitive := PRIMITIVE_TYPES.get(raw_type.lower())) is not None:
+        return TypeExpression("primitive", primitive)
+
+    if raw_type.lower() in VERBATIM_PRIMITIVE_TYPES:
+        return TypeExpression("primitive", sys.intern(raw_type))
+
+    return TypeExpression("reference", sys.intern(raw_type))
@@ -0,0 +1,95 @@
+import hashlib
+import json
+import logging
+import os
+
+from .output_sink import OutputSink
+
+log = logging.getLogger("docs_parser.output_manifest")
+
+
+class OutputManifest:
+    """
+    Record of the files generated into an output directory together with digests of their contents.
+
+    Each file is recorded with two digests: of its full contents and of its stable contents
+    (see `ConverterBase.stable_contents`). Files are written only when their digest changed,
+    files recorded by the previous run and not generated by the current one are removed.
+    A non-incremental manifest ignores the previous run and only records the generated files.
+    """
+
+    manifest_filename = ".manifest.json"
+
+    def __init__(self, output_dir: str, compare_full_contents: bool = False, manifest_filename: str = None,
+                 incremental: bool = True):
+        self.output_dir = output_dir
+        self.compare_full_contents = compare_full_contents
+        self.manifest_filename = manifest_filename or self.manifest_filename
+        self.previous: dict[str, tuple[str, str]] = self._load() if incremental else {}
+        self.current: dict[str, tuple[str, str]] = {}
+        self.written: list[str] = []
+        self.unchanged: list[str] = []
+        self.kept: list[str] = []
+        self.removed: list[str] = []
+
+    @property
+    def filepath(self) -> str:
+        return f"{self.output_dir}/{self.manifest_filename}"
+
+    def _load(self) -> dict[str, tuple[str, str]]:
+        try:
+            with open(self.filepath, "r", encoding="utf-8") as fd:
+                return {path: tuple(digests) for path, digests in json.load(fd)["files"].items()}
+
+        except FileNotFoundError:
+            return {}
+
+    @staticmethod
+    def digest(contents: bytes) -> str:
+        return hashlib.sha256(contents).hexdigest()
+
+    def _relpath(self, filepath: str) -> str:
+        return os.path.relpath(filepath, self.output_dir)
+
+    def is_recorded(self, filepath: str) -> bool:
+        return self._relpath(filepath) in self.previous and os.path.isfile(filepath)
+
+    def is_unchanged(self, filepath: str, digests: tuple[str, str]) -> bool:
+        previous = self.previous.get(self._relpath(filepath))
+        if previous is None or not os.path.isfile(filepath):
+            return False
+
+        full_digest, stable_digest = digests
+        if self.compare_full_contents:
+            return previous[0] == full_digest
+
+        return previous[1] == stable_digest
+
+    def record(self, filepath: str, digests: tuple[str, str] | None, written: bool):
+        relpath = self._relpath(filepath)
+        if written:
+            self.current[relpath] = digests
+            self.written.append(relpath)
+
+        else:
+            # the file on disk is kept as it is, so is its recorded digest
+            self.current[relpath] = self.previous[relpath]
+            self.unchanged.append(relpath)
+
+    def keep_previous(self):
+        """Records files of the previous run which were not generated by the current one as kept."""
+        for relpath in sorted(self.previous.keys() - self.current.keys()):
+            if os.path.isfile(f"{self.output_dir}/{relpath}"):
+                self.current[relpath] = self.previous[relpath]
+                self.kept.append(relpath)
+
+    def remove_stale(self, sink: OutputSink):
+        for relpath in sorted(self.previous.keys() - self.current.keys()):
+            filepath = f"{self.output_dir}/{relpath}"
+            log.debug("removing stale output file %s", filepath)
+            sink.remove(filepath)
+            self.removed.append(relpath)
+
+    def save(self, sink: OutputSink):
+        data = json.dumps({"files": dict(sorted(self.current.items()))}, indent=1)
+        sink.write(self.filepath, data.encode("utf-8"))
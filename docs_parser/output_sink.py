@@ -0,0 +1,346 @@
+import abc
+import ctypes
+import errno
+import io
+import logging
+import os
+import shutil
+import tarfile
+import time
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+
+log = logging.getLogger("docs_parser.output_sink")
+
+TAR_MODES = {
+    ".tar": "w|",
+    ".tar.gz": "w|gz",
+    ".tgz": "w|gz",
+    ".tar.bz2": "w|bz2",
+    ".tar.xz": "w|xz",
+}
+
+
+class OutputSink(metaclass=abc.ABCMeta):
+    """
+    Destination of the files generated by `generate`. Files are written between `begin` and `commit`,
+    `abort` discards everything written since `begin`.
+
+    Incremental sinks keep the files of the previous run, so unchanged files are not written again
+    and stale files are removed, see `OutputManifest`. Other sinks receive all the generated files on each run.
+    """
+
+    incremental = False
+
+    def begin(self, output_dirs: list[str], workers: int = 1):
+        pass
+
+    @abc.abstractmethod
+    def write(self, filepath: str, data: bytes):
+        pass
+
+    def remove(self, filepath: str):
+        pass
+
+    def commit(self):
+        pass
+
+    def abort(self):
+        pass
+
+
+AT_FDCWD = -100
+RENAME_EXCHANGE = 2
+
+
+def _load_renameat2():
+    try:
+        renameat2 = ctypes.CDLL(None, use_errno=True).renameat2
+
+    except (AttributeError, OSError, TypeError):
+        return None
+
+    renameat2.argtypes = (ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_char_p, ctypes.c_uint)
+    renameat2.restype = ctypes.c_int
+    return renameat2
+
+
+_renameat2 = _load_renameat2()
+
+
+def _exchange(first: str, second: str) -> bool:
+    """Atomically exchanges two paths, returns False where the platform or the file system cannot do it."""
+    if _renameat2 is None:
+        return False
+
+    if _renameat2(AT_FDCWD, os.fsencode(first), AT_FDCWD, os.fsencode(second), RENAME_EXCHANGE) == 0:
+        return True
+
+    if (error := ctypes.get_errno()) in (errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP):
+        return False
+
+    raise OSError(error, os.strerror(error), first, None, second)
+
+
+def _scan(directory: str) -> dict[str, int | None]:
+    # relative paths of the entries below the directory, files map to their inode numbers and directories to None;
+    # both are read from the directory listing, the files themselves are not accessed
+    entries, pending = {}, [""]
+    while pending:
+        relpath = pending.pop()
+        try:
+            with os.scandir(f"{directory}/{relpath}" if relpath else directory) as iterator:
+                for entry in iterator:
+                    entry_relpath = f"{relpath}/{entry.name}" if relpath else entry.name
+                    if entry.is_dir(follow_symlinks=False):
+                        entries[entry_relpath] = None
+                        pending.append(entry_relpath)
+
+                    else:
+                        entries[entry_relpath] = entry.inode()
+
+        except FileNotFoundError:
+            pass
+
+    return entries
+
+
+def _replace_file(filepath: str, data: bytes):
+    # the staged file may be a hard link to the file in the output directory, so it is never written in place
+    try:
+        os.unlink(filepath)
+
+    except FileNotFoundError:
+        pass
+
+    with open(filepath, "wb") as fd:
+        fd.write(data)
+
+
+class DirectorySink(OutputSink):
+    """
+    Writes the files into the output directories. Each output directory has a staging directory next to it which
+    holds the same files hard-linked, generated files are written and stale files removed there.
+    On commit, the two directories are exchanged atomically (`renameat2` with `RENAME_EXCHANGE`), so readers
+    see either the previous or the new tree, never a partially written one. Where the exchange is not supported,
+    the directories are swapped by renames and the output directory is momentarily missing.
+
+    The staging directory then holds the previous tree and is brought up to date when the next run begins,
+    only the entries whose inode differs from the output directory are relinked.
+    """
+
+    incremental = True
+    staging_suffix = ".staging"
+    previous_suffix = ".previous"
+
+    def __init__(self):
+        self.output_dirs: list[str] = []
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: list[Future] = []
+        self._created_dirs: set[str] = set()
+
+    def __str__(self) -> str:
+        return ", ".join(self.output_dirs)
+
+    def _staging_dir(self, output_dir: str) -> str:
+        return f"{output_dir}{self.staging_suffix}"
+
+    def _staged_filepath(self, filepath: str) -> str:
+        for output_dir in self.output_dirs:
+            if filepath.startswith(f"{output_dir}/"):
+                return f"{self._staging_dir(output_dir)}/{filepath[len(output_dir) + 1:]}"
+
+        raise ValueError(f"'{filepath}' is not in any of the output directories {self.output_dirs}")
+
+    def _link(self, source: str, destination: str):
+        try:
+            os.link(source, destination)
+
+        except OSError:
+            shutil.copy2(source, destination)
+
+    def _sync_staging(self, output_dir: str):
+        staging_dir = self._staging_dir(output_dir)
+        current, staged = _scan(output_dir), _scan(staging_dir)
+        os.makedirs(staging_dir, exist_ok=True)
+        # parents sort before their entries, entries of an already removed directory no longer exist
+        stale = [relpath for relpath, inode in sorted(staged.items()) if current.get(relpath, -1) != inode]
+        for relpath in stale:
+            if staged[relpath] is None:
+                shutil.rmtree(f"{staging_dir}/{relpath}", ignore_errors=True)
+
+            elif os.path.lexists(f"{staging_dir}/{relpath}"):
+                os.unlink(f"{staging_dir}/{relpath}")
+
+        missing = [relpath for relpath, inode in sorted(current.items()) if staged.get(relpath, -1) != inode]
+        for relpath in missing:
+            if current[relpath] is None:
+                os.makedirs(f"{staging_dir}/{relpath}", exist_ok=True)
+
+            else:
+                self._link(f"{output_dir}/{relpath}", f"{staging_dir}/{relpath}")
+
+        log.debug("synchronized %s with %s, %d stale and %d missing entries", staging_dir, output_dir,
+                  len(stale), len(missing))
+
+    def begin(self, output_dirs: list[str], workers: int = 1):
+        self.output_dirs = list(dict.fromkeys(output_dirs))
+        for output_dir in self.output_dirs:
+            self._sync_staging(output_dir)
+
+        self._created_dirs = set()
+        self._pending = []
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+
+    def write(self, filepath: str, data: bytes):
+        staged_filepath = self._staged_filepath(filepath)
+        # each directory is created only once, the files are written in the background
+        if (dirpath := os.path.dirname(staged_filepath)) not in self._created_dirs:
+            os.makedirs(dirpath, exist_ok=True)
+            self._created_dirs.add(dirpath)
+
+        self._pending.append(self._executor.submit(_replace_file, staged_filepath, data))
+
+    def remove(self, filepath: str):
+        try:
+            os.unlink(self._staged_filepath(filepath))
+
+        except FileNotFoundError:
+            pass
+
+    def _swap(self, output_dir: str):
+        staging_dir = self._staging_dir(output_dir)
+        if not os.path.isdir(output_dir):
+            os.rename(staging_dir, output_dir)
+            return
+
+        if _exchange(staging_dir, output_dir):
+            return
+
+        log.debug("atomic exchange is not supported, renaming %s into %s", staging_dir, output_dir)
+        previous_dir = f"{output_dir}{self.previous_suffix}"
+        if os.path.isdir(previous_dir):
+            shutil.rmtree(previous_dir)
+
+        os.rename(output_dir, previous_dir)
+        os.rename(staging_dir, output_dir)
+        os.rename(previous_dir, staging_dir)
+
+    def commit(self):
+        try:
+            for future in self._pending:
+                future.result()
+
+        finally:
+            self._executor.shutdown()
+
+        for output_dir in self.output_dirs:
+            log.debug("swapping staged output into %s", output_dir)
+            self._swap(output_dir)
+
+    def abort(self):
+        # the output directories are untouched, the staging directories are synchronized again by the next run
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+
+
+class ArchiveSink(OutputSink):
+    """
+    Streams the files into an archive as soon as they are generated, the file paths include the output directories.
+    The archive is written to a temporary file which replaces `filepath` on commit.
+    Entries have a fixed modification time, regardless of when they were generated.
+    """
+
+    def __init__(self, filepath: str, mtime: int = 0):
+        self.filepath = filepath
+        self.mtime = mtime
+
+    def __str__(self) -> str:
+        return self.filepath
+
+    @property
+    def tmp_filepath(self) -> str:
+        return f"{self.filepath}.tmp"
+
+    @abc.abstractmethod
+    def _open(self):
+        pass
+
+    @abc.abstractmethod
+    def _close(self):
+        pass
+
+    def begin(self, output_dirs: list[str], workers: int = 1):
+        if dirpath := os.path.dirname(self.filepath):
+            os.makedirs(dirpath, exist_ok=True)
+
+        self._open()
+
+    def commit(self):
+        self._close()
+        os.replace(self.tmp_filepath, self.filepath)
+
+    def abort(self):
+        self._close()
+        os.remove(self.tmp_filepath)
+
+
+class TarSink(ArchiveSink):
+    def _open(self):
+        mode = next(mode for suffix, mode in TAR_MODES.items() if self.filepath.endswith(suffix))
+        self._archive = tarfile.open(self.tmp_filepath, mode)
+
+    def _close(self):
+        self._archive.close()
+
+    def write(self, filepath: str, data: bytes):
+        info = tarfile.TarInfo(filepath)
+        info.size = len(data)
+        info.mtime = self.mtime
+        info.mode = 0o644
+        self._archive.addfile(info, io.BytesIO(data))
+
+
+class ZipSink(ArchiveSink):
+    def __init__(self, filepath: str, mtime: int = 0, compresslevel: int = 6):
+        super().__init__(filepath, mtime)
+        self.compresslevel = compresslevel
+
+    def _open(self):
+        self._archive = zipfile.ZipFile(self.tmp_filepath, "w", compression=zipfile.ZIP_DEFLATED,
+                                        compresslevel=self.compresslevel)
+
+    def _close(self):
+        self._archive.close()
+
+    def write(self, filepath: str, data: bytes):
+        # zip archives cannot represent dates before 1980
+        info = zipfile.ZipInfo(filepath, date_time=max((1980, 1, 1, 0, 0, 0), time.gmtime(self.mtime)[:6]))
+        info.compress_type = zipfile.ZIP_DEFLATED
+        info.external_attr = 0o644 << 16
+        self._archive.writestr(info, data, compresslevel=self.compresslevel)
+
+
+class MemorySink(OutputSink):
+    """
+    Collects the generated files in a mapping of their paths to their contents.
+    """
+
+    def __init__(self):
+        self.files: dict[str, bytes] = {}
+
+    def __str__(self) -> str:
+        return "memory"
+
+    def write(self, filepath: str, data: bytes):
+        self.files[filepath] = data
+
+
+def archive_sink(filepath: str) -> ArchiveSink:
+    if filepath.endswith(".zip"):
+        return ZipSink(filepath)
+
+    if filepath.endswith(tuple(TAR_MODES)):
+        return TarSink(filepath)
+
+    raise ValueError(f"unsupported archive format of '{filepath}', expected one of {[*TAR_MODES, '.zip']}")
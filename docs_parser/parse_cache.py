@@ -0,0 +1,92 @@
+import hashlib
+import logging
+import os
+import pickle
+import shutil
+from collections import Counter
+
+log = logging.getLogger("docs_parser.parse_cache")
+
+
+class ParseCache:
+    """
+    On-disk cache of parse results keyed by the SHA-256 of the parsed document and of the way it is parsed.
+
+    Documents are the per-API input shards, so only APIs whose HTML changed since the previous run
+    are parsed again. When every document hits, no HTML is parsed at all.
+    The whole cache is discarded once `version` differs from the version it was built by.
+    """
+
+    version_filename = "VERSION"
+
+    def __init__(self, directory: str = "cache/parse", version: int = 0):
+        self.directory = directory
+        self.version = version
+        self.stats = Counter()
+        self._used: set[str] = set()
+
+        os.makedirs(self.directory, exist_ok=True)
+        self._check_version()
+
+    def _check_version(self):
+        version_filepath = f"{self.directory}/{self.version_filename}"
+        try:
+            with open(version_filepath, "r") as fd:
+                cached_version = fd.read().strip()
+
+        except FileNotFoundError:
+            cached_version = None
+
+        if cached_version == str(self.version):
+            return
+
+        log.info("parser version changed from %s to %s, invalidating parse cache", cached_version, self.version)
+        shutil.rmtree(self.directory)
+        os.makedirs(self.directory)
+        with open(version_filepath, "w") as fd:
+            fd.write(str(self.version))
+
+    def _filepath(self, key: str) -> str:
+        return f"{self.directory}/{key}.pickle"
+
+    def key(self, document: str, variant: str = "") -> str:
+        """Key of the document parse result, `variant` distinguishes results of the same document parsed differently."""
+        digest = hashlib.sha256(document.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(variant.encode("utf-8"))
+        return digest.hexdigest()
+
+    def load(self, key: str):
+        self._used.add(key)
+        try:
+            with open(self._filepath(key), "rb") as fd:
+                result = pickle.load(fd)
+
+        except FileNotFoundError:
+            self.stats["miss"] += 1
+            return None
+
+        except (pickle.UnpicklingError, EOFError):
+            log.warning("discarding corrupted parse cache entry %s", key)
+            self.stats["miss"] += 1
+            return None
+
+        self.stats["hit"] += 1
+        return result
+
+    def store(self, key: str, result):
+        self._used.add(key)
+        filepath = self._filepath(key)
+        with open(f"{filepath}.tmp", "wb") as fd:
+            pickle.dump(result, fd, protocol=pickle.HIGHEST_PROTOCOL)
+
+        os.replace(f"{filepath}.tmp", filepath)
+
+    def prune(self):
+        """Removes entries of documents which were not a part of this run."""
+        for filename in os.listdir(self.directory):
+            key, extension = os.path.splitext(filename)
+            if extension == ".pickle" and key not in self._used:
+                log.debug("removing stale parse cache entry %s", key)
+                os.remove(f"{self.directory}/{filename}")
+                self.stats["pruned"] += 1
@@ -0,0 +1,100 @@
+import cProfile
+import json
+import logging
+import os
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import contextmanager
+
+try:
+    import resource as _resource
+
+except ImportError:  # not available on Windows
+    _resource = None
+
+log = logging.getLogger("docs_parser.profiling")
+
+
+def _peak_rss() -> int | None:
+    """Peak resident set size of this process and its finished children in bytes."""
+    if _resource is None:
+        return None
+
+    # ru_maxrss is reported in kilobytes on Linux
+    return 1024 * max(_resource.getrusage(_resource.RUSAGE_SELF).ru_maxrss,
+                      _resource.getrusage(_resource.RUSAGE_CHILDREN).ru_maxrss)
+
+
+class Profiler:
+    """
+    Collects phase timings, per-item measurements and counters of a run into a machine-readable report.
+
+    All methods are no-ops until the profiler is enabled, so the module-level `profiler` instance
+    can be used in the hot loops unconditionally. Items measured inside of worker processes are not collected.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.pstats_dir: str | None = None
+        self.phases: dict[str, dict[str, float]] = {}
+        self.records: dict[str, dict[str, object]] = defaultdict(dict)
+        self.counters = Counter()
+        self._lock = threading.Lock()
+
+    def enable(self, pstats_dir: str = None):
+        self.enabled = True
+        self.pstats_dir = pstats_dir
+        if pstats_dir:
+            os.makedirs(pstats_dir, exist_ok=True)
+
+    @contextmanager
+    def phase(self, name: str):
+        if not self.enabled:
+            yield
+            return
+
+        profile = cProfile.Profile() if self.pstats_dir else None
+        wall_start, cpu_start = time.perf_counter(), time.process_time()
+        if profile is not None:
+            profile.enable()
+
+        try:
+            yield
+
+        finally:
+            if profile is not None:
+                profile.disable()
+                profile.dump_stats(f"{self.pstats_dir}/{name}.pstats")
+
+            self.phases[name] = {
+                "wall_time": time.perf_counter() - wall_start,
+                "cpu_time": time.process_time() - cpu_start,
+                "peak_rss": _peak_rss(),
+            }
+            log.info("phase %s finished: %s", name, self.phases[name])
+
+    def record(self, category: str, key: str, value):
+        if self.enabled:
+            with self._lock:
+                self.records[category][key] = value
+
+    def count(self, counter: str, n: int = 1):
+        if self.enabled:
+            with self._lock:
+                self.counters[counter] += n
+
+    def report(self) -> dict:
+        return {
+            "phases": self.phases,
+            "counters": dict(self.counters),
+            **self.records,
+        }
+
+    def write_report(self, filepath: str):
+        log.info("writing profiling report to %s", filepath)
+        with open(filepath, "w", encoding="utf-8") as fd:
+            json.dump(self.report(), fd, indent=2)
+
+
+profiler = Profiler()
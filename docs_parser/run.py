@@ -1,238 +1,735 @@
-import os
-import re
-from collections import defaultdict
+import json
+import multiprocessing
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Iterable, Iterator
 
 import logging
 import requests
 from requests.adapters import HTTPAdapter
 from bs4 import BeautifulSoup
 
-from .converters import PHPClassConverter
+from .converters import ConverterBase, PHPClassConverter, SourceIndex, TypeScriptInterfaceConverter
+from .extraction import EXTRACTORS, ResourceRecord
+from .http_cache import HttpCache
+from .input_store import InputStore
+from .ir import dump_ir, load_ir
+from .output_manifest import OutputManifest
+from .output_sink import DirectorySink, OutputSink
+from .parse_cache import ParseCache
+from .profiling import profiler
+from .scheduler import RequestScheduler, ScheduledSession
+from .schema_diff import affected_objects, diff
+from .selection import ResourceSelection
+from .sharding import Shard
+from .snapshot_store import SnapshotStore, SnapshotWriter
 from .objects import *
 
 log = logging.getLogger("docs_parser.run")
 
 
-def download() -> str:
-    log.debug("running docs download")
-    log.info("downloading APIs landing page")
-    s = requests.Session()
-    s.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=1, max_retries=3))
+DOCS_URL = "https://developer.riotgames.com"
+
+
+def _fetch(s: requests.Session, key: str, url: str, cache: HttpCache = None) -> tuple[str, int]:
+    # the response body and the number of its bytes received over the network
+    if cache is not None:
+        return cache.fetch(s, key, url)
 
-    r = s.get("https://developer.riotgames.com/apis")
+    r = s.get(url)
     r.raise_for_status()
-    soup = BeautifulSoup(r.content, "html5lib")
+    return r.text, len(r.content)
+
+
+def _download_api_details(s: requests.Session, api_name: str, base_url: str, cache: HttpCache = None,
+                          store: InputStore = None, snapshot: SnapshotWriter = None) -> str:
+    api_link = f"{base_url}/api-details/{api_name}"
+    log.debug("downloading API details for %s from %s", api_name, api_link)
+    start = time.perf_counter()
+    data, received = _fetch(s, api_name, api_link, cache)
+    profiler.record("http", api_name, {"latency": time.perf_counter() - start, "bytes": received})
+    html = json.loads(data)["html"]
+    if store is not None:
+        # shards are written as soon as they arrive
+        store.write_shard(api_name, html)
+
+    if snapshot is not None:
+        snapshot.add(api_name, html)
+
+    return html
+
+
+def create_session(workers: int = 1, scheduler: RequestScheduler = None) -> requests.Session:
+    s = ScheduledSession(scheduler) if scheduler is not None else requests.Session()
+    # the scheduler retries on its own, retries of urllib3 would multiply them and bypass its rate limit
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=workers, max_retries=0 if scheduler is not None else 3)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    return s
+
+
+def download_api_names(s: requests.Session, base_url: str = DOCS_URL, cache: HttpCache = None) -> list[str]:
+    log.info("downloading APIs landing page")
+    data, _ = _fetch(s, "_landing", f"{base_url}/apis", cache)
+    soup = BeautifulSoup(data, "html5lib")
+    return [api_option["api-name"] for api_option in soup.select("a.api_option")]
+
+
+def download_iter(workers: int = 1, base_url: str = DOCS_URL, cache: HttpCache = None,
+                  store: InputStore = None, session: requests.Session = None,
+                  api_names: list[str] = None, snapshots: SnapshotStore = None,
+                  scheduler: RequestScheduler = None,
+                  selection: ResourceSelection = None) -> Iterator[tuple[str, str]]:
+    """
+    Downloads API details and yields their names and HTML in the landing page order as soon as they arrive.
+    Each API is also written into the input store (and the snapshot archive when given), the manifests
+    are written once all of them are downloaded.
+    The given session is reused and kept open, API names are downloaded from the landing page when not given.
+    Requests of a new session are sent through the scheduler when given.
+    APIs not selected by their name are not downloaded, their previously downloaded details are kept in the store.
+    """
+    log.debug("running docs download, workers=%d", workers)
+    store = store or InputStore()
+    s = session or create_session(workers, scheduler)
+    if api_names is None:
+        api_names = download_api_names(s, base_url, cache)
+
+    skipped = set()
+    if selection is not None:
+        skipped = {api_name for api_name in api_names if not selection.selects_api(api_name)}
+        log.info("skipping download of %d APIs which are not selected", len(skipped))
+
+    snapshot = snapshots.writer() if snapshots is not None else None
 
     apis = []
     apis_errored = []
-    api_data = ""
-    for api_option in soup.select("a.api_option"):
-        api_option_name = api_option["api-name"]
-        api_option_link = f"https://developer.riotgames.com/api-details/{api_option_name}"
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        pending: deque[tuple[str, Future]] = deque()
 
-        try:
-            log.debug("downloading API details for %s from %s", api_option_name, api_option_link)
-            r = s.get(api_option_link)
-            r.raise_for_status()
-            api_option_data = r.json()
+        def collect() -> Iterator[tuple[str, str]]:
+            api_option_name, future = pending.popleft()
+            try:
+                html = future.result()
+                apis.append(api_option_name)
 
-            apis.append(api_option_name)
-            api_data += api_option_data["html"]
+            except Exception as ex:
+                apis_errored.append(api_option_name)
+                log.exception("download and processing of API details for %s failed!", api_option_name)
+                return
 
-        except Exception as ex:
-            apis_errored.append(api_option_name)
-            log.exception("download and processing of API details for %s failed!", api_option_name)
+            yield api_option_name, html
+
+        # submission is bounded so that only a few payloads wait in memory, results keep the landing page order
+        for api_name in api_names:
+            if api_name in skipped:
+                continue
+
+            future = executor.submit(_download_api_details, s, api_name, base_url, cache, store, snapshot)
+            pending.append((api_name, future))
+            if len(pending) >= 2 * workers:
+                yield from collect()
+
+        while pending:
+            yield from collect()
 
     log.info("successfully downloaded API details of %s", apis)
     if apis_errored:
         log.warning("some API details failed to be downloaded: %s", apis_errored)
 
-    output_filepath = "input/input.html"
-    log.debug("writing downloaded API details to '%s'", output_filepath)
-    with open(output_filepath, "wb") as fd:
-        fd.write(api_data.encode("utf-8"))
+    if cache is not None:
+        cache.prune()
+        log.info("download cache statistics: %s", dict(cache.stats))
+
+    if scheduler is not None:
+        log.info("request scheduler statistics: %s, final rate %.2f req/s", dict(scheduler.stats), scheduler.rate)
+
+    downloaded = set(apis)
+    store.write_manifest([
+        api_name
+        for api_name in api_names
+        if api_name in downloaded or (api_name in skipped and store.has_shard(api_name))
+    ])
+    if snapshot is not None:
+        # APIs skipped by the selection are missing in the snapshot
+        snapshot.commit(apis, subset=bool(skipped))
+
+    if session is None:
+        s.close()
+
+
+def download(workers: int = 1, base_url: str = DOCS_URL, cache: HttpCache = None,
+             store: InputStore = None, snapshots: SnapshotStore = None,
+             scheduler: RequestScheduler = None, selection: ResourceSelection = None) -> InputStore:
+    store = store or InputStore()
+    for _ in download_iter(workers=workers, base_url=base_url, cache=cache, store=store, snapshots=snapshots,
+                           scheduler=scheduler, selection=selection):
+        pass
+
+    return store
+
+
+PARSER_BACKENDS = ("html5lib", "lxml", "html.parser")
+# increase whenever the parsing logic changes, cached parse results of older versions are discarded
+PARSER_VERSION = 3
+
+IGNORE_RESOURCES = {
+    1246,  # lol-status-v3
+    # 1420,  # match-v4
+}
+
+
+def create_selection(include: list[str] = (), exclude: list[str] = ()) -> ResourceSelection:
+    """
+    Creates a resource selection from KEY=VALUE criteria, resources in `IGNORE_RESOURCES` are excluded
+    unless they are explicitly included by their id.
+    """
+    included = ResourceSelection(include).include
+    ignored = [f"id={resource_id}" for resource_id in sorted(IGNORE_RESOURCES)
+               if ("id", str(resource_id)) not in included]
+    return ResourceSelection(include, [*ignored, *exclude])
+
+
+def _is_subset(selection: ResourceSelection | None) -> bool:
+    # the default selection only leaves out resources in IGNORE_RESOURCES, keys of equal selections are equal
+    return selection is not None and selection.key != create_selection().key
+
+
+def _parse_resource(resource_data: ResourceRecord, objects: dict[str, ObjectDefinition]) -> Resource:
+    resource_link = resource_data.link
+    _, resource_id = resource_data.element["id"].rsplit("_")
+    resource_name, resource_version = resource_data.element["api-name"].rsplit("-", maxsplit=1)
+
+    resource = Resource(
+        id=int(resource_id),
+        name=sys.intern(resource_name),
+        version=sys.intern(resource_version),
+        api_link=resource_link,
+        operations=[],
+    )
+    log.info("processing resource %s", resource.as_source)
+
+    for operation_data in resource_data.operations:
+        operation_link = operation_data.link
+        operation_method, operation_id = operation_link.rsplit("/", maxsplit=1)[1].split("_")
+        operation_path = operation_data.path.strip()
+
+        operation = Operation(
+            id=operation_id,
+            method=sys.intern(operation_method),
+            returns="_unknown_",
+            docs_link="https://developer.riotgames.com/apis" + operation_link,
+            api_path=operation_path,
+        )
+        resource.operations.append(operation)
+        log.info("processing operation %s.%s", resource.name, operation.id)
+
+        for object_data in operation_data.bodies:
+            if "Return value:" in object_data.text:
+                _, return_type = object_data.text.split(":")
+                operation.returns = return_type.strip()
+                log.info("designated operation return type: %s", operation.returns)
+                continue
+
+            elif object_data.heading is None:
+                log.warning("skipping definition: %s", object_data.element)
+                continue
+
+            object_name = object_data.heading.strip().replace("DTO", "Dto")
+            if object_name in objects:
+                obj = objects[object_name]
+                log.debug("reusing definition of object %s", obj.name)
+
+            else:
+                obj = ObjectDefinition(
+                    name=object_name,
+                    description="",
+                    properties=dict(),
+                    sources=Sources(),
+                )
+                objects[obj.name] = obj
+                log.info("created new definition of object %s", obj.name)
+
+            obj.sources.add(resource, operation)
+            log.debug("adding new source to object definition, resource=%s, operation=%s",
+                      resource.as_source, operation.id)
+
+            for prop_entry in object_data.rows:
+                prop_name, prop_type, prop_desc = prop_entry
+                prop_name = sys.intern(prop_name.strip())
+                if prop_name in obj.properties:
+                    prop = obj.properties[prop_name]
+                    log.debug("reusing definition of object property %s", prop.name)
+
+                else:
+                    prop = ObjectProperty(
+                        name=prop_name,
+                        type=sys.intern(prop_type.strip()),
+                        description=prop_desc.strip(),
+                        sources=Sources(),
+                    )
+                    obj.properties[prop.name] = prop
+                    log.info("created new definition of object property %s", prop.name)
+
+                prop.sources.add(resource, operation)
+                log.debug("adding new source to object property definition, resource=%s, operation=%s",
+                          resource.as_source, operation.id)
+
+    return resource
+
+
+def _parse_document(document: str, parser: str, extractor: str = "single-pass",
+                    selection: ResourceSelection = None) -> list[tuple[Resource, dict[str, ObjectDefinition]]]:
+    selection = selection or create_selection()
+    soup = BeautifulSoup(document, parser)
+    results = []
+    for resource_data in EXTRACTORS[extractor](soup, selection.selects_element):
+        # API bases are known only once the operations are extracted
+        if not selection.selects_record(resource_data):
+            log.info("skipping resource %s which is not selected", resource_data.element["api-name"])
+            continue
+
+        objects: dict[str, ObjectDefinition] = dict()
+        start = time.perf_counter()
+        resource = _parse_resource(resource_data, objects)
+        profiler.record("parse_resources", resource.as_source, time.perf_counter() - start)
+        results.append((resource, objects))
+
+    return results
+
+
+def _completed(result) -> Future:
+    future = Future()
+    future.set_result(result)
+    return future
+
+
+def _called(fn, *args) -> Future:
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+
+    except Exception as ex:
+        future.set_exception(ex)
+
+    return future
 
-    s.close()
-    return api_data
 
+def _parse_documents(content: Iterable[str], parser: str, workers: int, cache: ParseCache = None,
+                     extractor: str = "single-pass", selection: ResourceSelection = None, skip_errors: bool = False
+                     ) -> Iterator[list[tuple[Resource, dict[str, ObjectDefinition]]] | None]:
+    # with skip_errors, documents which fail to be parsed are logged and yield None instead of raising
+    selection = selection or create_selection()
+    executor = None
+    if workers > 1:
+        # documents may be provided by download threads which are still running, forking them could copy
+        # locks held by those threads (e.g. of logging handlers) into the workers and deadlock them
+        start_method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(start_method))
 
-def parse(content: str = None) -> tuple[list[Resource], list[ObjectDefinition]]:
-    log.debug("running docs parsing")
+    pending: deque[tuple[str | None, bool, Future]] = deque()
+
+    def collect():
+        key, cached, future = pending.popleft()
+        try:
+            results = future.result()
+
+        except Exception as ex:
+            if not skip_errors:
+                raise
+
+            log.exception("parsing of API details failed!")
+            return None
+
+        if key is not None and not cached:
+            cache.store(key, results)
+
+        return results
+
+    try:
+        for document in content:
+            # results depend on the parser backend, the extractor and the selection, so do their cache entries
+            key = cache.key(document, f"{parser};{extractor};{selection.key}") if cache is not None else None
+            if not selection.selects_document(document):
+                log.debug("skipping document without any selected resource")
+                pending.append((None, True, _completed([])))
+
+            elif key is not None and (results := cache.load(key)) is not None:
+                pending.append((key, True, _completed(results)))
+
+            elif executor is None:
+                pending.append((key, False, _called(_parse_document, document, parser, extractor, selection)))
+
+            else:
+                pending.append((key, False, executor.submit(_parse_document, document, parser, extractor, selection)))
+
+            # submission is bounded so that the documents are still loaded lazily, results keep the input order
+            if len(pending) >= 2 * workers:
+                yield collect()
+
+        while pending:
+            yield collect()
+
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _merge_objects(objects: dict[str, ObjectDefinition], partial_objects: dict[str, ObjectDefinition]):
+    # the first definition of each object and property wins, their sources are unioned
+    for partial_obj in partial_objects.values():
+        if (obj := objects.get(partial_obj.name)) is None:
+            objects[partial_obj.name] = partial_obj
+            continue
+
+        log.debug("merging definition of object %s", obj.name)
+        obj.sources.update(partial_obj.sources)
+        for partial_prop in partial_obj.properties.values():
+            if (prop := obj.properties.get(partial_prop.name)) is None:
+                obj.properties[partial_prop.name] = partial_prop
+                continue
+
+            prop.sources.update(partial_prop.sources)
+
+
+def parse_iter(content: str | Iterable[str] = None, parser: str = "html5lib", workers: int = 1,
+               cache: ParseCache = None, extractor: str = "single-pass",
+               selection: ResourceSelection = None) -> Iterator[tuple[Resource, list[ObjectDefinition]]]:
+    """
+    Parses the documents one by one as they are provided and yields each parsed resource together with
+    the (merged) object definitions it created or updated. Only the selected resources are parsed,
+    resources in `IGNORE_RESOURCES` by default.
+    """
+    log.debug("running docs parsing, parser=%s, workers=%d, selection=%s", parser, workers, selection)
+    selection = selection or create_selection()
     if not content:
-        input_filename = "input/input.html"
-        log.debug("loading docs sources from %s", input_filename)
-        with open(input_filename, "r") as f:
-            content = f.readlines()
-        content = "".join([str(line) for line in content])
-
-    ignore_resources = {
-        1246,  # lol-status-v3
-        # 1420,  # match-v4
-    }
-
-    soup = BeautifulSoup(content, "html5lib")
+        content = InputStore()
+
+    elif isinstance(content, str):
+        content = [content]
+
+    resource_count = 0
     objects: dict[str, ObjectDefinition] = dict()
-    resources: list[Resource] = list()
-    for resource_data in soup.select(".resource"):
-        resource_link = resource_data.find("a")["href"]
-        _, resource_id = resource_data["id"].rsplit("_")
-        resource_name, resource_version = resource_data["api-name"].rsplit("-", maxsplit=1)
-
-        resource = Resource(
-            id=int(resource_id),
-            name=resource_name,
-            version=resource_version,
-            api_link=resource_link,
-            operations=[],
-        )
-        resources.append(resource)
-        if resource.id in ignore_resources:
-            log.info("ignoring resource %s", resource.as_source)
-            continue
+    # documents are loaded one by one, parsed resources are merged in the document order
+    for results in _parse_documents(content, parser, workers, cache, extractor, selection):
+        for resource, partial_objects in results:
+            _merge_objects(objects, partial_objects)
+            resource_count += 1
+            yield resource, [objects[object_name] for object_name in partial_objects]
 
-        log.info("processing resource %s", resource.as_source)
-
-        for operation_data in resource_data.select(".operation"):
-            operation_link = operation_data.find("a")["href"]
-            operation_method, operation_id = operation_link.rsplit("/", maxsplit=1)[1].split("_")
-            operation_path = operation_data.select_one("span.path").text.strip()
-
-            operation = Operation(
-                id=operation_id,
-                method=operation_method,
-                returns="_unknown_",
-                docs_link="https://developer.riotgames.com/apis" + operation_link,
-                api_path=operation_path,
-            )
-            resource.operations.append(operation)
-            log.info("processing operation %s.%s", resource.name, operation.id)
-
-            for object_data in operation_data.select(".response_body"):
-                if "Return value:" in object_data.text:
-                    _, return_type = object_data.text.split(":")
-                    operation.returns = return_type.strip()
-                    log.info("designated operation return type: %s", operation.returns)
-                    continue
-
-                elif (object_heading := object_data.select_one("h5")) is None:
-                    if (object_heading := object_data.select_one("div > b")) is None:
-                        log.warning("skipping definition: %s", object_data)
-                        continue
-
-                object_name = object_heading.text.strip().replace("DTO", "Dto")
-                if object_name in objects:
-                    obj = objects[object_name]
-                    log.debug("reusing definition of object %s", obj.name)
+    if cache is not None:
+        # entries of the resources which were not selected are still valid
+        if not _is_subset(selection):
+            cache.prune()
 
-                else:
-                    obj = ObjectDefinition(
-                        name=object_name,
-                        description="",
-                        properties=dict(),
-                        sources=defaultdict(set),
-                    )
-                    objects[obj.name] = obj
-                    log.info("created new definition of object %s", obj.name)
+        log.info("parse cache statistics: %s", dict(cache.stats))
 
-                obj.sources[resource].add(operation)
-                log.debug("adding new source to object definition, resource=%s, operation=%s",
-                          resource.as_source, operation.id)
+    profiler.count("resources_parsed", resource_count)
+    profiler.count("objects_parsed", len(objects))
+    log.info("located %d resources and parsed %d objects", resource_count, len(objects))
 
-                for prop_entry in object_data.select("table > tbody tr"):
-                    prop_name, prop_type, prop_desc = prop_entry.select("td")
-                    prop_name = prop_name.text.strip()
-                    if prop_name in obj.properties:
-                        prop = obj.properties[prop_name]
-                        log.debug("reusing definition of object property %s", prop.name)
-
-                    else:
-                        prop_type, is_array = prop_type.text.strip(), False
-                        if match := re.match(r"^.*\[(.+)]$", prop_type):
-                            prop_type, is_array = match.group(1), True
-
-                        prop = ObjectProperty(
-                            name=prop_name,
-                            type=prop_type,
-                            description=prop_desc.text.strip(),
-                            sources=defaultdict(set),
-                            is_array=is_array
-                        )
-                        obj.properties[prop.name] = prop
-                        log.info("created new definition of object property %s", prop.name)
-
-                    prop.sources[resource].add(operation)
-                    log.debug("adding new source to object property definition, resource=%s, operation=%s",
-                              resource.as_source, operation.id)
-
-    object_list = list(objects.values())
-    log.info("located %d resources and parsed %d objects", len(resources), len(object_list))
-    return resources, object_list
-
-
-def generate(resources: list[Resource], objects: list[ObjectDefinition]):
-    log.debug("running docs conversion")
-    converter = PHPClassConverter(resources)
-    converter.output_dir = "output"
-    converter.nullable_fields = {
-        "LeagueEntryDto.miniSeries",
-        "LeagueItemDto.miniSeries",
-        "LobbyEventDto.summonerId",
-        "TournamentCodeDto.metaData",
-        "Perks.perkIds",
-        "StatusDto.updated_at",
-        "StatusDto.archive_at",
-        "StatusDto.maintenance_status",
-    }
-    converter.iterable_classes = {
-        "ChampionListDto": "champions",
-        "CurrentGameInfo": "participants",
-        "FeaturedGames": "gameList",
-        "FeaturedGameInfo": "participants",
-        "Incident": "updates",
-        "LeagueListDto": "entries",
-        "LobbyEventDtoWrapper": "eventList",
-        "MasteryPageDto": "masteries",
-        "MasteryPagesDto": "pages",
-        "MatchlistDto": "matches",
-        "MatchTimelineDto": "frames",
-        "Message": "translations",
-        "Perks": "perkIds",
-        "PlayerStatsSummaryListDto": "playerStatSummaries",
-        "RankedStatsDto": "champions",
-        "RecentGamesDto": "games",
-        "RunePageDto": "slots",
-        "RunePagesDto": "pages",
-        "Service": "incidents",
-        "ShardStatus": "services",
-        "Timeline": "frames",
-    }
-    converter.linkable_classes = {
-        "BannedChampion": ("getStaticChampion", "championId"),
-        "ChampionDto": ("getStaticChampion", "id"),
-        "ChampionMasteryDto": ("getStaticChampion", "championId"),
-        "CurrentGameParticipant": ("getStaticChampion", "championId"),
-        "MatchReferenceDto": ("getStaticChampion", "champion"),
-        "Participant": ("getStaticChampion", "championId"),
-        "ParticipantDto": ("getStaticChampion", "championId"),
-        "TeamBansDto": ("getStaticChampion", "championId"),
-    }
 
+def parse(content: str | Iterable[str] = None, parser: str = "html5lib", workers: int = 1,
+          cache: ParseCache = None, extractor: str = "single-pass",
+          selection: ResourceSelection = None) -> tuple[list[Resource], list[ObjectDefinition]]:
+    objects: dict[str, ObjectDefinition] = dict()
+    resources: list[Resource] = list()
+    for resource, updated_objects in parse_iter(content, parser=parser, workers=workers, cache=cache,
+                                                extractor=extractor, selection=selection):
+        resources.append(resource)
+        for obj in updated_objects:
+            objects.setdefault(obj.name, obj)
+
+    return resources, list(objects.values())
+
+
+NULLABLE_FIELDS = {
+    "LeagueEntryDto.miniSeries",
+    "LeagueItemDto.miniSeries",
+    "LobbyEventDto.summonerId",
+    "TournamentCodeDto.metaData",
+    "Perks.perkIds",
+    "StatusDto.updated_at",
+    "StatusDto.archive_at",
+    "StatusDto.maintenance_status",
+}
+
+ITERABLE_CLASSES = {
+    "ChampionListDto": "champions",
+    "CurrentGameInfo": "participants",
+    "FeaturedGames": "gameList",
+    "FeaturedGameInfo": "participants",
+    "Incident": "updates",
+    "LeagueListDto": "entries",
+    "LobbyEventDtoWrapper": "eventList",
+    "MasteryPageDto": "masteries",
+    "MasteryPagesDto": "pages",
+    "MatchlistDto": "matches",
+    "MatchTimelineDto": "frames",
+    "Message": "translations",
+    "Perks": "perkIds",
+    "PlayerStatsSummaryListDto": "playerStatSummaries",
+    "RankedStatsDto": "champions",
+    "RecentGamesDto": "games",
+    "RunePageDto": "slots",
+    "RunePagesDto": "pages",
+    "Service": "incidents",
+    "ShardStatus": "services",
+    "Timeline": "frames",
+}
+
+LINKABLE_CLASSES = {
+    "BannedChampion": ("getStaticChampion", "championId"),
+    "ChampionDto": ("getStaticChampion", "id"),
+    "ChampionMasteryDto": ("getStaticChampion", "championId"),
+    "CurrentGameParticipant": ("getStaticChampion", "championId"),
+    "MatchReferenceDto": ("getStaticChampion", "champion"),
+    "Participant": ("getStaticChampion", "championId"),
+    "ParticipantDto": ("getStaticChampion", "championId"),
+    "TeamBansDto": ("getStaticChampion", "championId"),
+}
+
+CONVERTERS: dict[str, type[ConverterBase]] = {
+    "php": PHPClassConverter,
+    "typescript": TypeScriptInterfaceConverter,
+}
+OUTPUT_DIRS = {
+    "php": "output",
+    "typescript": "output-ts",
+}
+
+
+def create_converter(target: str, resources: list[Resource], template_path: str = None) -> ConverterBase:
+    converter = CONVERTERS[target](resources)
+    converter.output_dir = OUTPUT_DIRS[target]
+    converter.template_path = template_path
+    converter.nullable_fields = NULLABLE_FIELDS
+    if isinstance(converter, PHPClassConverter):
+        converter.iterable_classes = ITERABLE_CLASSES
+        converter.linkable_classes = LINKABLE_CLASSES
+
+    return converter
+
+
+# converters and shard of the rendering worker process, set once by the pool initializer
+# instead of being sent with each task
+_render_converters: list[ConverterBase] | None = None
+_render_shard: Shard | None = None
+
+
+def _init_render_worker(converters: list[ConverterBase], shard: Shard | None):
+    global _render_converters, _render_shard
+    _render_converters = converters
+    _render_shard = shard
+
+
+def _packages(converter: ConverterBase, obj: ObjectDefinition, shard: Shard = None) -> list[tuple[str, Operation]]:
+    return [
+        (package, op)
+        for package, op in converter.packages(obj)
+        if shard is None or shard.owns(package, obj.name)
+    ]
+
+
+def _render_objects(objects: list[ObjectDefinition], converters: list[ConverterBase] = None,
+                    shard: Shard = None) -> list[tuple[int, str, str, bytes, tuple[str, str]]]:
+    if converters is None:
+        converters, shard = _render_converters, _render_shard
+
+    files = []
     for obj in objects:
-        packages = converter.packages(obj)
-        for package, op in packages:
-            dirpath = converter.dirname(op)
-            os.makedirs(dirpath, exist_ok=True)
-            filepath = f"{dirpath}/{converter.filename(obj)}"
-            log.debug("writing definition of object %s to %s", obj.name, filepath)
-            with open(filepath, "wb") as fd:
-                fd.write(converter.contents(obj, op).lstrip().encode("utf-8"))
-
-
-def run(run_download: bool):
-    content = None
-    if run_download:
-        content = download()
-
-    resources, objects = parse(content)
-    generate(resources, objects)
+        # each object is fanned out to all the targets at once
+        for converter_id, converter in enumerate(converters):
+            for package, op in _packages(converter, obj, shard):
+                filepath = f"{converter.dirname(op)}/{converter.filename(obj)}"
+                contents = converter.contents(obj, op).lstrip()
+                data = contents.encode("utf-8")
+                digests = (
+                    OutputManifest.digest(data),
+                    OutputManifest.digest(converter.stable_contents(contents).encode("utf-8")),
+                )
+                files.append((converter_id, obj.name, filepath, data, digests))
+
+    return files
+
+
+def _render(converters: list[ConverterBase], objects: list[ObjectDefinition], workers: int,
+            shard: Shard = None) -> Iterator[tuple[int, str, str, bytes, tuple[str, str]]]:
+    if workers == 1:
+        yield from _render_objects(objects, converters, shard)
+        return
+
+    chunk_size = max(1, len(objects) // (workers * 4))
+    chunks = [objects[i:i + chunk_size] for i in range(0, len(objects), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker,
+                             initargs=(converters, shard)) as executor:
+        for files in executor.map(_render_objects, chunks):
+            yield from files
+
+
+def _keep_unaffected(converters: list[ConverterBase], manifests: list[OutputManifest],
+                     objects: list[ObjectDefinition], affected: set[str],
+                     shard: Shard = None) -> list[ObjectDefinition]:
+    # files of unaffected objects are kept without rendering, as long as all of them were generated before
+    objects_to_render = []
+    for obj in objects:
+        filepaths = [
+            (converter_id, f"{converter.dirname(op)}/{converter.filename(obj)}")
+            for converter_id, converter in enumerate(converters)
+            for package, op in _packages(converter, obj, shard)
+        ]
+        if obj.name in affected or not all(manifests[converter_id].is_recorded(filepath)
+                                           for converter_id, filepath in filepaths):
+            objects_to_render.append(obj)
+            continue
+
+        for converter_id, filepath in filepaths:
+            manifests[converter_id].record(filepath, None, written=False)
+
+    return objects_to_render
+
+
+def generate(resources: list[Resource], objects: list[ObjectDefinition], update_copyright_year: bool = False,
+             workers: int = 1, converters: list[ConverterBase] = None, affected: set[str] = None,
+             sink: OutputSink = None, shard: Shard = None, selection: ResourceSelection = None):
+    """
+    Generates output files of the objects by all the converters into the sink, output directories by default.
+    When names of affected objects are given, only these objects are rendered, files of the other objects
+    are kept as they are (incremental sinks only). When a shard is given, only files of the shard are generated
+    and recorded in a manifest of the shard, see `merge_shards`. When a selection other than the default one
+    is given, only the selected resources and objects received from them are generated and files of the previous
+    run which were not generated are kept, stale files are removed only by runs without a selection.
+    """
+    subset = _is_subset(selection)
+    if subset:
+        resources, objects = selection.apply(resources, objects)
+
+    if converters is None:
+        converters = [create_converter("php", resources)]
+
+    if sink is None:
+        sink = DirectorySink()
+
+    log.debug("running docs conversion, converters=%s, workers=%d, sink=%s, shard=%s",
+              [type(converter).__name__ for converter in converters], workers, type(sink).__name__, shard)
+
+    # the target-independent precomputation is shared by all the converters
+    index = SourceIndex(resources)
+    index.build(objects)
+    for converter in converters:
+        converter.prepare(objects, index)
+
+    manifests = [
+        OutputManifest(converter.output_dir, compare_full_contents=update_copyright_year,
+                       manifest_filename=shard.manifest_filename if shard is not None else None,
+                       incremental=sink.incremental)
+        for converter in converters
+    ]
+    if affected is not None and sink.incremental:
+        objects = _keep_unaffected(converters, manifests, objects, affected, shard)
+        log.debug("rendering %d affected objects", len(objects))
+
+    elif affected is not None:
+        log.warning("%s does not keep files of the previous run, rendering all objects", type(sink).__name__)
+
+    sink.begin([converter.output_dir for converter in converters], workers)
+    try:
+        for converter_id, obj_name, filepath, data, digests in _render(converters, objects, workers, shard):
+            manifest = manifests[converter_id]
+            if manifest.is_unchanged(filepath, digests):
+                log.debug("definition of object %s in %s is unchanged", obj_name, filepath)
+                manifest.record(filepath, digests, written=False)
+                continue
+
+            log.debug("writing definition of object %s to %s", obj_name, filepath)
+            sink.write(filepath, data)
+            manifest.record(filepath, digests, written=True)
+
+        for manifest in manifests:
+            if subset:
+                # files of the resources which are not selected are not known, none of them is removed
+                manifest.keep_previous()
+
+            manifest.remove_stale(sink)
+            manifest.save(sink)
+
+        sink.commit()
+
+    except BaseException:
+        log.debug("discarding the output written to %s", sink)
+        sink.abort()
+        raise
+
+    for manifest in manifests:
+        profiler.count("files_rendered", len(manifest.written) + len(manifest.unchanged))
+        profiler.count("files_written", len(manifest.written))
+        profiler.count("files_unchanged", len(manifest.unchanged))
+        profiler.count("files_kept", len(manifest.kept))
+        profiler.count("files_removed", len(manifest.removed))
+        log.info("generated files in %s: %d written, %d unchanged, %d kept, %d removed", manifest.output_dir,
+                 len(manifest.written), len(manifest.unchanged), len(manifest.kept), len(manifest.removed))
+
+
+def run(run_download: bool, download_workers: int = 1, download_cache: HttpCache = None,
+        parser: str = "html5lib", parse_workers: int = 1, parse_cache: ParseCache = None,
+        update_copyright_year: bool = False, generate_workers: int = 1,
+        ir_input: str = None, ir_output: str = None, targets: list[str] = ("php",), stream: bool = False,
+        templates: dict[str, str] = None, diff_from: str = None, diff_report: str = "schema-diff.json",
+        diff_only: bool = False, snapshots: SnapshotStore = None, snapshot: str = None,
+        scheduler: RequestScheduler = None, sink: OutputSink = None, shard: Shard = None,
+        selection: ResourceSelection = None):
+    if ir_input:
+        with profiler.phase("load_ir"):
+            resources, objects = load_ir(ir_input)
+
+    else:
+        content = None
+        if snapshot:
+            content = snapshots.open(snapshot)
+            log.info("parsing snapshot %s created at %s", content.name, content.created)
+
+        elif run_download and stream:
+            # API details are parsed while the rest of them is still being downloaded
+            content = (html for _, html in download_iter(workers=download_workers, cache=download_cache,
+                                                         snapshots=snapshots, scheduler=scheduler,
+                                                         selection=selection))
+
+        elif run_download:
+            with profiler.phase("download"):
+                content = download(workers=download_workers, cache=download_cache, snapshots=snapshots,
+                                   scheduler=scheduler, selection=selection)
+
+        with profiler.phase("download_and_parse" if run_download and stream else "parse"):
+            resources, objects = parse(content, parser=parser, workers=parse_workers, cache=parse_cache,
+                                       selection=selection)
+
+    if ir_output:
+        dump_ir(resources, objects, ir_output)
+
+    affected = None
+    if diff_from:
+        # only objects affected by the changes since the given snapshot are regenerated
+        previous = load_ir(diff_from)
+        if _is_subset(selection):
+            # resources which were not selected are not compared, they are not removed
+            previous = selection.apply(*previous)
+
+        schema_diff = diff(previous, (resources, objects))
+        log.info("writing schema diff to %s", diff_report)
+        with open(diff_report, "w", encoding="utf-8") as fd:
+            json.dump(schema_diff, fd, ensure_ascii=False, indent=1)
+
+        affected = affected_objects(schema_diff, objects)
+        log.info("%d objects are affected by the changes since %s", len(affected), diff_from)
+        if diff_only:
+            return
+
+    with profiler.phase("generate"):
+        templates = templates or {}
+        converters = [create_converter(target, resources, templates.get(target)) for target in targets]
+        generate(resources, objects, update_copyright_year=update_copyright_year, workers=generate_workers,
+                 converters=converters, affected=affected, sink=sink, shard=shard,
+                 selection=selection)
+
     log.info("finished!")
@@ -0,0 +1,212 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+import requests
+
+log = logging.getLogger("docs_parser.scheduler")
+
+
+class CircuitOpenError(requests.RequestException):
+    pass
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket, the rate can be changed at any time.
+    """
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+
+                wait = (1.0 - self._tokens) / self.rate
+
+            time.sleep(wait)
+
+
+class RequestScheduler:
+    """
+    Schedules the requests of a session, see `ScheduledSession`.
+
+    Requests are limited by a token bucket whose rate adapts to the server: it is increased additively
+    after each successful request up to `max_rate` and halved whenever the server throttles (429, 503),
+    down to `min_rate`. Throttled requests are retried after the `Retry-After` delay (which pauses the whole host,
+    at most for `max_pause`, longer delays count as failures of the URL), failed ones (5xx, connection errors)
+    after an exponential backoff with full jitter.
+    Concurrent requests are capped per host. URLs which keep failing trip a circuit breaker and are not requested
+    again until `breaker_cooldown` passes.
+    """
+
+    throttling_status_codes = {429, 503}
+    retryable_status_codes = {500, 502, 504}
+
+    def __init__(self, rate: float = 10.0, max_rate: float = 100.0, min_rate: float = 0.5, burst: float = 4.0,
+                 max_per_host: int = 8, max_retries: int = 5, backoff_base: float = 0.5, backoff_max: float = 60.0,
+                 max_pause: float = 60.0, breaker_threshold: int = 3, breaker_cooldown: float = 300.0):
+        self.max_rate = max_rate
+        self.min_rate = min_rate
+        self.max_per_host = max_per_host
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.max_pause = max_pause
+        self.breaker_threshold = breaker_threshold
+        self.breaker_cooldown = breaker_cooldown
+        self.bucket = TokenBucket(min(rate, max_rate), burst)
+        self.stats = Counter()
+
+        self._lock = threading.Lock()
+        self._host_slots: dict[str, threading.BoundedSemaphore] = {}
+        self._paused_until: dict[str, float] = {}
+        self._failures: dict[str, int] = {}
+        self._open_until: dict[str, float] = {}
+
+    @property
+    def rate(self) -> float:
+        return self.bucket.rate
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _slots(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if (slots := self._host_slots.get(host)) is None:
+                slots = self._host_slots[host] = threading.BoundedSemaphore(self.max_per_host)
+
+            return slots
+
+    def _wait_for_host(self, host: str):
+        while (delay := self._paused_until.get(host, 0.0) - time.monotonic()) > 0:
+            time.sleep(delay)
+
+    def _check_circuit(self, url: str):
+        with self._lock:
+            if (open_until := self._open_until.get(url)) is None:
+                return
+
+            if time.monotonic() < open_until:
+                self.stats["rejected"] += 1
+                raise CircuitOpenError(f"circuit is open for {url}")
+
+            # half-open, a single request decides whether the circuit closes again
+            del self._open_until[url]
+            self._failures[url] = self.breaker_threshold - 1
+
+    def _record_result(self, url: str, success: bool):
+        with self._lock:
+            if success:
+                self._failures.pop(url, None)
+                self.bucket.rate = min(self.max_rate, self.bucket.rate + 1.0)
+                return
+
+            self._failures[url] = failures = self._failures.get(url, 0) + 1
+            if failures >= self.breaker_threshold:
+                log.warning("opening circuit for %s after %d failures", url, failures)
+                self.stats["circuits_opened"] += 1
+                self._open_until[url] = time.monotonic() + self.breaker_cooldown
+
+    def _throttled(self, url: str, host: str, response: requests.Response, attempt: int):
+        delay = self._retry_after(response)
+        if delay is None:
+            delay = self._backoff(attempt)
+
+        elif delay > self.max_pause:
+            # a server asking for an excessive pause is treated as failing instead of stalling the host
+            log.warning("%s asked to retry %s after %.0fs, pausing for %.2fs only", host, url, delay, self.max_pause)
+            delay = self.max_pause
+            self._record_result(url, success=False)
+
+        with self._lock:
+            self.stats["throttled"] += 1
+            self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+            self._paused_until[host] = max(self._paused_until.get(host, 0.0), time.monotonic() + delay)
+
+        log.info("throttled by %s, pausing for %.2fs, rate lowered to %.2f req/s", host, delay, self.bucket.rate)
+
+    @staticmethod
+    def _retry_after(response: requests.Response) -> float | None:
+        if (value := response.headers.get("Retry-After")) is None:
+            return None
+
+        try:
+            return max(0.0, float(value))
+
+        except ValueError:
+            pass
+
+        try:
+            return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - time.time())
+
+        except (TypeError, ValueError):
+            return None
+
+    def _backoff(self, attempt: int) -> float:
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** attempt))
+
+    def request(self, send, method: str, url: str, **kwargs) -> requests.Response:
+        host = urlsplit(url).netloc
+        for attempt in range(self.max_retries + 1):
+            # the circuit may open while the request is being retried
+            self._check_circuit(url)
+            self._wait_for_host(host)
+            self.bucket.acquire()
+            self._count("requests")
+            try:
+                with self._slots(host):
+                    response = send(method, url, **kwargs)
+
+            except requests.ConnectionError:
+                if attempt == self.max_retries:
+                    self._record_result(url, success=False)
+                    raise
+
+                self._count("retried")
+                time.sleep(self._backoff(attempt))
+                continue
+
+            if response.status_code in self.throttling_status_codes and attempt < self.max_retries:
+                self._throttled(url, host, response, attempt)
+                continue
+
+            if response.status_code in self.retryable_status_codes and attempt < self.max_retries:
+                self._count("retried")
+                time.sleep(self._backoff(attempt))
+                continue
+
+            self._record_result(url, success=response.status_code < 500 and response.status_code != 429)
+            return response
+
+
+class ScheduledSession(requests.Session):
+    """
+    Session sending all of its requests through the given scheduler.
+    """
+
+    def __init__(self, scheduler: RequestScheduler):
+        super().__init__()
+        self.scheduler = scheduler
+
+    def request(self, method, url, *args, **kwargs) -> requests.Response:
+        if args:
+            raise TypeError("scheduled requests accept keyword arguments only")
+
+        return self.scheduler.request(super().request, method, url, **kwargs)
@@ -0,0 +1,163 @@
+import logging
+
+from .objects import *
+
+log = logging.getLogger("docs_parser.schema_diff")
+
+OperationKey = tuple[int, str, str, str]
+
+
+def _operation_key(resource: Resource, operation: Operation) -> OperationKey:
+    return resource.id, resource.version, operation.method, operation.id
+
+
+def _operation_label(key: OperationKey) -> str:
+    resource_id, version, method, operation_id = key
+    return f"{resource_id} ({version}) {method} {operation_id}"
+
+
+def _source_keys(sources: Sources) -> dict[OperationKey, None]:
+    return {_operation_key(resource, operation): None for resource, operation in sources.pairs()}
+
+
+def _changes(old, new, fields: tuple[str, ...]) -> dict[str, list]:
+    return {
+        field: [old_value, new_value]
+        for field in fields
+        if (old_value := getattr(old, field)) != (new_value := getattr(new, field))
+    }
+
+
+def _diff_keys(old: dict, new: dict) -> tuple[list, list, list]:
+    # keys are reported in the order of the snapshots they come from
+    added = [key for key in new if key not in old]
+    removed = [key for key in old if key not in new]
+    common = [key for key in new if key in old]
+    return added, removed, common
+
+
+def _diff_sources(old: Sources, new: Sources) -> dict[str, list[str]]:
+    added, removed, _ = _diff_keys(_source_keys(old), _source_keys(new))
+    if not added and not removed:
+        return {}
+
+    return {
+        "added": [_operation_label(key) for key in added],
+        "removed": [_operation_label(key) for key in removed],
+    }
+
+
+def _diff_properties(old: ObjectDefinition, new: ObjectDefinition) -> dict:
+    added, removed, common = _diff_keys(old.properties, new.properties)
+    changed = {}
+    for name in common:
+        old_prop, new_prop = old.properties[name], new.properties[name]
+        changes = _changes(old_prop, new_prop, ("type", "description"))
+        if sources := _diff_sources(old_prop.sources, new_prop.sources):
+            changes["sources"] = sources
+
+        if changes:
+            changed[name] = changes
+
+    if not added and not removed and not changed:
+        return {}
+
+    return {"added": added, "removed": removed, "changed": changed}
+
+
+def diff(old: tuple[list[Resource], list[ObjectDefinition]],
+         new: tuple[list[Resource], list[ObjectDefinition]]) -> dict:
+    """
+    Compares two snapshots of the parsed API docs in linear time. Resources are matched by their id and version,
+    operations by their resource, method and id, objects and properties by their names.
+    """
+    (old_resources, old_objects), (new_resources, new_objects) = old, new
+    old_resource_index = {(resource.id, resource.version): resource for resource in old_resources}
+    new_resource_index = {(resource.id, resource.version): resource for resource in new_resources}
+    old_operation_index = {
+        _operation_key(resource, operation): operation
+        for resource in old_resources
+        for operation in resource.operations
+    }
+    new_operation_index = {
+        _operation_key(resource, operation): operation
+        for resource in new_resources
+        for operation in resource.operations
+    }
+    old_object_index = {obj.name: obj for obj in old_objects}
+    new_object_index = {obj.name: obj for obj in new_objects}
+
+    added, removed, common = _diff_keys(old_resource_index, new_resource_index)
+    resources = {
+        "added": [new_resource_index[key].as_source for key in added],
+        "removed": [old_resource_index[key].as_source for key in removed],
+        "changed": {
+            new_resource_index[key].as_source: changes
+            for key in common
+            if (changes := _changes(old_resource_index[key], new_resource_index[key], ("name", "api_link")))
+        },
+    }
+
+    added, removed, common = _diff_keys(old_operation_index, new_operation_index)
+    operations = {
+        "added": [_operation_label(key) for key in added],
+        "removed": [_operation_label(key) for key in removed],
+        "changed": {
+            _operation_label(key): changes
+            for key in common
+            if (changes := _changes(old_operation_index[key], new_operation_index[key],
+                                    ("returns", "docs_link", "api_path")))
+        },
+    }
+
+    added, removed, common = _diff_keys(old_object_index, new_object_index)
+    changed = {}
+    for name in common:
+        old_obj, new_obj = old_object_index[name], new_object_index[name]
+        changes = _changes(old_obj, new_obj, ("description",))
+        if sources := _diff_sources(old_obj.sources, new_obj.sources):
+            changes["sources"] = sources
+
+        if properties := _diff_properties(old_obj, new_obj):
+            changes["properties"] = properties
+
+        if changes:
+            changed[name] = changes
+
+    objects = {"added": added, "removed": removed, "changed": changed}
+    return {"resources": resources, "operations": operations, "objects": objects}
+
+
+def referencing_objects(objects: list[ObjectDefinition], object_names: set[str]) -> set[str]:
+    """
+    Returns names of the objects having a property of any of the given object types.
+    """
+    # type names are normalized the same way object names are by the parser
+    return {
+        obj.name
+        for obj in objects
+        if any(object_names.intersection(name.replace("DTO", "Dto") for name in prop.type_expression.references())
+               for prop in obj.properties.values())
+    }
+
+
+def affected_objects(schema_diff: dict, objects: list[ObjectDefinition]) -> set[str]:
+    """
+    Returns names of the objects of the new snapshot whose generated output may differ because of the changes.
+    """
+    affected = set(schema_diff["objects"]["added"]) | schema_diff["objects"]["changed"].keys()
+    changed_resources = set(schema_diff["resources"]["changed"])
+    changed_operations = set(schema_diff["operations"]["changed"])
+    # objects received from changed resources or operations mention them in their output
+    if changed_resources or changed_operations:
+        for obj in objects:
+            sources = [obj.sources, *(prop.sources for prop in obj.properties.values())]
+            if any(resource.as_source in changed_resources
+                   or _operation_label(_operation_key(resource, operation)) in changed_operations
+                   for obj_sources in sources
+                   for resource, operation in obj_sources.pairs()):
+                affected.add(obj.name)
+
+    # removed objects may still be referenced by other objects
+    return affected | referencing_objects(objects, affected | set(schema_diff["objects"]["removed"]))
+
@@ -0,0 +1,165 @@
+import dataclasses
+import logging
+import re
+from typing import Iterable
+
+from bs4 import Tag
+
+from .extraction import ResourceRecord
+from .objects import ObjectDefinition, Resource, Sources
+
+log = logging.getLogger("docs_parser.selection")
+
+CRITERIA = ("id", "name", "version", "api", "base")
+
+RESOURCE_TAG_PATTERN = re.compile(r'<div\b[^>]*\bclass="(?:[^"]*\s)?resource(?:\s[^"]*)?"[^>]*>')
+RESOURCE_ID_PATTERN = re.compile(r'\bid="resource_(\d+)"')
+RESOURCE_API_NAME_PATTERN = re.compile(r'\bapi-name="([^"]*)"')
+OPERATION_PATH_PATTERN = re.compile(r'<span\b[^>]*\bclass="(?:[^"]*\s)?path(?:\s[^"]*)?"[^>]*>\s*/([^/<\s]*)/')
+
+
+def _api_base(api_path: str) -> str:
+    _, api_path_base, _ = f"{api_path.strip()}//".split("/", maxsplit=2)
+    return api_path_base
+
+
+class ResourceSelection:
+    """
+    Selection of resources by include and exclude criteria, each written as KEY=VALUE where KEY is one of
+    `id` (e.g. id=1246), `name` (champion-mastery), `version` (v4), `api` (name and version as listed
+    on the landing page, champion-mastery-v4) and `base` (API base of the operation paths: lol, lor, val, tft, riot).
+    A resource is selected when it matches any of the include criteria (or there are none) and none of the exclude
+    criteria.
+
+    Only some attributes of a resource are known before it is parsed (the landing page lists API names only,
+    API bases are known from the operations), so each stage skips the resources it can already decide about:
+    downloads by the API name, documents by the attributes of their resource elements and their operation paths
+    before they are parsed, resources once their operations are extracted.
+    """
+
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = ()):
+        self.include = [self._parse_criterion(criterion) for criterion in include]
+        self.exclude = [self._parse_criterion(criterion) for criterion in exclude]
+
+    @staticmethod
+    def _parse_criterion(criterion: str) -> tuple[str, str]:
+        key, separator, value = criterion.partition("=")
+        key, value = key.strip().lower(), value.strip().lower()
+        if not separator or key not in CRITERIA or not value or (key == "id" and not value.isdigit()):
+            raise ValueError(f"invalid resource criterion '{criterion}', "
+                             f"expected KEY=VALUE with KEY one of {', '.join(CRITERIA)}")
+
+        return key, str(int(value)) if key == "id" else value
+
+    @property
+    def key(self) -> str:
+        """Canonical representation of the criteria, equal selections have equal keys."""
+        include = ",".join(sorted({f"{key}={value}" for key, value in self.include}))
+        exclude = ",".join(sorted({f"{key}={value}" for key, value in self.exclude}))
+        return f"include={include};exclude={exclude}"
+
+    def __repr__(self) -> str:
+        return f"ResourceSelection({self.key})"
+
+    @staticmethod
+    def _match(criterion: tuple[str, str], attributes: dict) -> bool | None:
+        key, value = criterion
+        if (attribute := attributes.get(key)) is None:
+            return None
+
+        if key == "base":
+            return value in attribute
+
+        return attribute == value
+
+    def _decide(self, **attributes) -> bool | None:
+        # None when the known attributes are not enough to decide
+        excluded = [self._match(criterion, attributes) for criterion in self.exclude]
+        if True in excluded:
+            return False
+
+        included = [self._match(criterion, attributes) for criterion in self.include]
+        if included and all(match is False for match in included):
+            return False
+
+        if None in excluded or (included and True not in included):
+            return None
+
+        return True
+
+    @staticmethod
+    def _api_attributes(api_name: str) -> dict[str, str]:
+        api_name = api_name.lower()
+        name, _, version = api_name.rpartition("-")
+        return {"api": api_name, "name": name, "version": version}
+
+    def selects_api(self, api_name: str) -> bool:
+        """Whether the API may be selected, decided by its name only."""
+        return self._decide(**self._api_attributes(api_name)) is not False
+
+    def selects_document(self, document: str) -> bool:
+        """Whether any resource of the document may be selected, decided without parsing it."""
+        tags = list(RESOURCE_TAG_PATTERN.finditer(document))
+        for index, tag in enumerate(tags):
+            resource_id = RESOURCE_ID_PATTERN.search(tag[0])
+            api_name = RESOURCE_API_NAME_PATTERN.search(tag[0])
+            if resource_id is None or api_name is None:
+                return True
+
+            # operations of a resource are located between its element and the element of the next resource
+            end = tags[index + 1].start() if index + 1 < len(tags) else len(document)
+            bases = {base.lower() for base in OPERATION_PATH_PATTERN.findall(document, tag.end(), end)} or None
+            if self._decide(id=resource_id[1], base=bases, **self._api_attributes(api_name[1])) is not False:
+                return True
+
+        # documents without recognizable resource elements are parsed
+        return not tags
+
+    def selects_element(self, element: Tag) -> bool:
+        """Whether the resource element may be selected, decided before its contents are extracted."""
+        _, resource_id = element["id"].rsplit("_")
+        return self._decide(id=resource_id, **self._api_attributes(element["api-name"])) is not False
+
+    def selects_record(self, record: ResourceRecord) -> bool:
+        _, resource_id = record.element["id"].rsplit("_")
+        bases = {_api_base(operation.path).lower() for operation in record.operations}
+        return self._decide(id=resource_id, base=bases, **self._api_attributes(record.element["api-name"])) is True
+
+    def selects(self, resource: Resource) -> bool:
+        bases = {_api_base(operation.api_path).lower() for operation in resource.operations}
+        return self._decide(id=str(resource.id), base=bases,
+                            **self._api_attributes(f"{resource.name}-{resource.version}")) is True
+
+    def apply(self, resources: list[Resource],
+              objects: list[ObjectDefinition]) -> tuple[list[Resource], list[ObjectDefinition]]:
+        """
+        Restricts a parsed model to the selected resources. Objects and properties keep only their sources
+        from the selected resources, the ones received from other resources only are left out. Definitions
+        are kept as they were merged, so they may come from a resource which is not selected, unlike definitions
+        parsed with the selection.
+        """
+        selected = [resource for resource in resources if self.selects(resource)]
+        if len(selected) == len(resources):
+            return resources, objects
+
+        selected_ids = {id(resource) for resource in selected}
+
+        def selected_sources(sources: Sources) -> Sources:
+            return Sources([(resource, operation) for resource, operation in sources.pairs()
+                            if id(resource) in selected_ids])
+
+        selected_objects = []
+        for obj in objects:
+            if not (sources := selected_sources(obj.sources)):
+                continue
+
+            properties = {}
+            for name, prop in obj.properties.items():
+                if prop_sources := selected_sources(prop.sources):
+                    properties[name] = dataclasses.replace(prop, sources=prop_sources)
+
+            selected_objects.append(dataclasses.replace(obj, properties=properties, sources=sources))
+
+        log.info("selected %d of %d resources and %d of %d objects", len(selected), len(resources),
+                 len(selected_objects), len(objects))
+        return selected, selected_objects
@@ -0,0 +1,172 @@
+import json
+import logging
+import os
+import re
+import tarfile
+import zipfile
+import zlib
+from dataclasses import dataclass
+
+from .output_manifest import OutputManifest
+from .output_sink import TAR_MODES, OutputSink
+
+log = logging.getLogger("docs_parser.sharding")
+
+SHARD_MANIFEST_PATTERN = re.compile(r"^\.manifest\.shard-(\d+)-of-(\d+)\.json$")
+
+
+class ShardMergeError(ValueError):
+    pass
+
+
+@dataclass(frozen=True, slots=True)
+class Shard:
+    """
+    Slice `index` (from 1) of `count` of the generated files. Each file belongs to exactly one shard,
+    decided by a stable hash of its package and object name, so independent processes or machines
+    generating all the shards produce the complete output.
+    """
+
+    index: int
+    count: int
+
+    @classmethod
+    def parse(cls, value: str) -> "Shard":
+        index, _, count = value.partition("/")
+        try:
+            shard = cls(int(index), int(count))
+
+        except ValueError:
+            raise ValueError(f"invalid shard '{value}', expected INDEX/COUNT") from None
+
+        if not 1 <= shard.index <= shard.count:
+            raise ValueError(f"invalid shard '{value}', index must be between 1 and {shard.count}")
+
+        return shard
+
+    @property
+    def name(self) -> str:
+        return f"shard-{self.index}-of-{self.count}"
+
+    @property
+    def manifest_filename(self) -> str:
+        return f".manifest.{self.name}.json"
+
+    def owns(self, package: str, object_name: str) -> bool:
+        # the built-in hash of strings is salted per process, so it can not be used here
+        return zlib.crc32(f"{package}/{object_name}".encode("utf-8")) % self.count == self.index - 1
+
+    def __str__(self) -> str:
+        return f"{self.index}/{self.count}"
+
+
+def read_files(source: str) -> dict[str, bytes]:
+    """Reads all files of a shard output, either a directory containing the output directories or an archive."""
+    if os.path.isdir(source):
+        files = {}
+        for dirpath, _, filenames in os.walk(source):
+            for filename in filenames:
+                filepath = os.path.join(dirpath, filename)
+                with open(filepath, "rb") as fd:
+                    files[os.path.relpath(filepath, source)] = fd.read()
+
+        return files
+
+    if source.endswith(".zip"):
+        with zipfile.ZipFile(source) as archive:
+            return {name: archive.read(name) for name in archive.namelist() if not name.endswith("/")}
+
+    if source.endswith(tuple(TAR_MODES)):
+        with tarfile.open(source) as archive:
+            return {member.name: archive.extractfile(member).read() for member in archive.getmembers()
+                    if member.isfile()}
+
+    raise ShardMergeError(f"shard output '{source}' is neither a directory nor a supported archive")
+
+
+def _collect_shards(sources: list[str]) -> dict[str, dict[str, tuple[bytes, tuple[str, str], Shard]]]:
+    outputs: dict[str, dict[str, tuple[bytes, tuple[str, str], Shard]]] = {}
+    shards: dict[tuple[str, Shard], str] = {}
+    for source in sources:
+        files = read_files(source)
+        for manifest_filepath in sorted(files):
+            output_dir, manifest_filename = os.path.split(manifest_filepath)
+            if (match := SHARD_MANIFEST_PATTERN.match(manifest_filename)) is None:
+                continue
+
+            shard = Shard(int(match[1]), int(match[2]))
+            log.info("merging shard %s of %s from %s", shard, output_dir, source)
+            if (output_dir, shard) in shards:
+                raise ShardMergeError(f"shard {shard} of {output_dir} is contained in both {shards[output_dir, shard]} "
+                                      f"and {source}")
+
+            shards[output_dir, shard] = source
+
+            output = outputs.setdefault(output_dir, {})
+            for relpath, digests in json.loads(files[manifest_filepath])["files"].items():
+                filepath = f"{output_dir}/{relpath}"
+                if (data := files.get(filepath)) is None:
+                    raise ShardMergeError(f"{filepath} of shard {shard} is missing in {source}")
+
+                if OutputManifest.digest(data) != digests[0]:
+                    raise ShardMergeError(f"contents of {filepath} of shard {shard} in {source} do not match "
+                                          f"its manifest")
+
+                if filepath in output:
+                    raise ShardMergeError(f"{filepath} was generated by both shard {output[filepath][2]} "
+                                          f"and shard {shard}")
+
+                output[filepath] = data, tuple(digests), shard
+
+    if not shards:
+        raise ShardMergeError(f"there are no shard manifests in {sources}")
+
+    # all the shards must come from the same split, each of them complete for every output directory
+    if len(counts := {shard.count for _, shard in shards}) > 1:
+        raise ShardMergeError(f"shards of different splits can not be merged, shard counts are {sorted(counts)}")
+
+    count = counts.pop()
+    for output_dir in outputs:
+        if missing := [index for index in range(1, count + 1) if (output_dir, Shard(index, count)) not in shards]:
+            raise ShardMergeError(f"shards {missing} of {count} of {output_dir} are missing")
+
+    return outputs
+
+
+def merge_shards(sources: list[str], sink: OutputSink, update_copyright_year: bool = False, workers: int = 1):
+    """
+    Combines shard outputs (see `read_files`) into the sink. All files listed by the shard manifests are verified
+    against their digests and checked for collisions, i.e. files generated by more than one shard,
+    then written together with a single manifest of each output directory.
+    """
+    outputs = _collect_shards(sources)
+    manifests = {
+        output_dir: OutputManifest(output_dir, compare_full_contents=update_copyright_year,
+                                   incremental=sink.incremental)
+        for output_dir in outputs
+    }
+
+    sink.begin(list(outputs), workers)
+    try:
+        for output_dir, files in outputs.items():
+            manifest = manifests[output_dir]
+            for filepath, (data, digests, _) in files.items():
+                if manifest.is_unchanged(filepath, digests):
+                    manifest.record(filepath, digests, written=False)
+                    continue
+
+                sink.write(filepath, data)
+                manifest.record(filepath, digests, written=True)
+
+            manifest.remove_stale(sink)
+            manifest.save(sink)
+
+        sink.commit()
+
+    except BaseException:
+        sink.abort()
+        raise
+
+    for manifest in manifests.values():
+        log.info("merged files in %s: %d written, %d unchanged, %d removed", manifest.output_dir,
+                 len(manifest.written), len(manifest.unchanged), len(manifest.removed))
@@ -0,0 +1,185 @@
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Iterator
+
+log = logging.getLogger("docs_parser.snapshot_store")
+
+
+class Snapshot:
+    """
+    Read-only view of a stored snapshot. Iterating it yields the API details in the landing page order,
+    each of them is decompressed in memory only when it is needed.
+    """
+
+    def __init__(self, store: "SnapshotStore", name: str, apis: list[tuple[str, str]], created: str,
+                 subset: bool = False):
+        self.store = store
+        self.name = name
+        self.apis = apis
+        self.created = created
+        self.subset = subset
+
+    def names(self) -> list[str]:
+        return [api_name for api_name, _ in self.apis]
+
+    def read_shard(self, api_name: str) -> str:
+        digest = dict(self.apis)[api_name]
+        return self.store.read_blob(digest)
+
+    def __iter__(self) -> Iterator[str]:
+        for api_name, digest in self.apis:
+            log.debug("loading docs sources of %s from snapshot %s", api_name, self.name)
+            yield self.store.read_blob(digest)
+
+
+class SnapshotWriter:
+    """
+    Collects API details of a single download, payloads are stored as soon as they are added (from any thread),
+    the snapshot manifest is written by `commit`.
+    """
+
+    def __init__(self, store: "SnapshotStore"):
+        self.store = store
+        self.digests: dict[str, str] = {}
+
+    def add(self, api_name: str, html: str):
+        self.digests[api_name] = self.store.write_blob(html)
+
+    def commit(self, api_names: list[str], subset: bool = False) -> str:
+        return self.store.write_manifest([(api_name, self.digests[api_name]) for api_name in api_names], subset=subset)
+
+
+class SnapshotStore:
+    """
+    Archive of downloaded API details. Each download is stored as a timestamped snapshot manifest listing
+    the APIs and digests of their payloads, the payloads themselves are stored gzip-compressed
+    and addressed by their content, so payloads which did not change between downloads are stored only once.
+    Snapshots of downloads restricted to some of the APIs are marked as subsets, they are never the latest snapshot.
+
+        snapshots/{name}.json
+        snapshots/blobs/{digest[:2]}/{digest}.html.gz
+    """
+
+    manifest_suffix = ".json"
+
+    def __init__(self, directory: str = "snapshots", compresslevel: int = 6):
+        self.directory = directory
+        self.blobs_directory = f"{directory}/blobs"
+        self.compresslevel = compresslevel
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def blob_filepath(self, digest: str) -> str:
+        return f"{self.blobs_directory}/{digest[:2]}/{digest}.html.gz"
+
+    def manifest_filepath(self, name: str) -> str:
+        return f"{self.directory}/{name}{self.manifest_suffix}"
+
+    def write_blob(self, html: str) -> str:
+        data = html.encode("utf-8")
+        digest = self.digest(data)
+        filepath = self.blob_filepath(digest)
+        if os.path.isfile(filepath):
+            log.debug("payload %s is already stored", digest)
+            return digest
+
+        os.makedirs(os.path.dirname(filepath), exist_ok=True)
+        # several threads may store the same payload at once, each of them writes its own temporary file
+        tmp_filepath = f"{filepath}.{threading.get_ident()}.tmp"
+        with open(tmp_filepath, "wb") as fd:
+            # the fixed mtime keeps the compressed payload deterministic
+            fd.write(gzip.compress(data, compresslevel=self.compresslevel, mtime=0))
+
+        os.replace(tmp_filepath, filepath)
+        return digest
+
+    def read_blob(self, digest: str) -> str:
+        with gzip.open(self.blob_filepath(digest), "rt", encoding="utf-8") as fd:
+            return fd.read()
+
+    def writer(self) -> SnapshotWriter:
+        return SnapshotWriter(self)
+
+    def write_manifest(self, apis: list[tuple[str, str]], name: str = None, subset: bool = False) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        created = datetime.datetime.now(datetime.timezone.utc)
+        name = name or created.strftime("%Y%m%dT%H%M%SZ")
+        if name in (names := self.names()):
+            # snapshots created within the same second are numbered
+            name = f"{name}-{len([other for other in names if self._sort_key(other)[0] == name])}"
+
+        filepath = self.manifest_filepath(name)
+        log.info("writing %ssnapshot %s of %d APIs to '%s'", "subset " if subset else "", name, len(apis), filepath)
+        with open(f"{filepath}.tmp", "w", encoding="utf-8") as fd:
+            json.dump({"created": created.isoformat(), "subset": subset, "apis": apis}, fd, indent=1)
+
+        os.replace(f"{filepath}.tmp", filepath)
+        return name
+
+    @staticmethod
+    def _sort_key(name: str) -> tuple[str, int]:
+        # timestamp and number of the snapshot, "-10" sorts after "-2"
+        timestamp, _, number = name.rpartition("-")
+        if timestamp and number.isdigit():
+            return timestamp, int(number)
+
+        return name, 0
+
+    def names(self) -> list[str]:
+        """Returns names of the stored snapshots from the oldest one."""
+        if not os.path.isdir(self.directory):
+            return []
+
+        return sorted(
+            (
+                filename[:-len(self.manifest_suffix)]
+                for filename in os.listdir(self.directory)
+                if filename.endswith(self.manifest_suffix)
+            ),
+            key=self._sort_key,
+        )
+
+    def latest(self) -> str | None:
+        """Returns name of the newest snapshot which is not a subset."""
+        return next((name for name in reversed(self.names()) if not self.open(name).subset), None)
+
+    def open(self, name: str = "latest") -> Snapshot:
+        if name == "latest":
+            if (name := self.latest()) is None:
+                raise FileNotFoundError(f"there are no complete snapshots in '{self.directory}'")
+
+        with open(self.manifest_filepath(name), "r", encoding="utf-8") as fd:
+            manifest = json.load(fd)
+
+        return Snapshot(self, name, [tuple(api) for api in manifest["apis"]], manifest["created"],
+                        manifest.get("subset", False))
+
+    def prune(self, keep: int):
+        """
+        Removes all but the latest `keep` snapshots and payloads no longer referenced by any snapshot,
+        the latest complete snapshot is always kept.
+        """
+        names, latest = self.names(), self.latest()
+        for name in names[:max(0, len(names) - keep)]:
+            if name == latest:
+                continue
+
+            log.info("removing snapshot %s", name)
+            os.remove(self.manifest_filepath(name))
+
+        referenced = {digest for name in self.names() for _, digest in self.open(name).apis}
+        if not os.path.isdir(self.blobs_directory):
+            return
+
+        for dirpath, _, filenames in os.walk(self.blobs_directory):
+            for filename in filenames:
+                if filename.split(".", 1)[0] not in referenced:
+                    log.debug("removing unreferenced payload %s", filename)
+                    os.remove(f"{dirpath}/{filename}")
@@ -0,0 +1,188 @@
+import dataclasses
+import hashlib
+import logging
+import time
+
+from .http_cache import HttpCache
+from .input_store import InputStore
+from .objects import ObjectDefinition, Resource
+from .profiling import profiler
+from .run import (DOCS_URL, _merge_objects, _parse_documents, create_converter, create_session, download_api_names,
+                  download_iter, generate)
+from .scheduler import RequestScheduler
+from .selection import ResourceSelection
+from .schema_diff import referencing_objects
+
+log = logging.getLogger("docs_parser.watch")
+
+
+def _digest(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def _copy_object(obj: ObjectDefinition) -> ObjectDefinition:
+    # merging mutates the first definition of each object, the kept parse results must stay intact
+    return dataclasses.replace(
+        obj,
+        properties={
+            name: dataclasses.replace(prop, sources=prop.sources.copy())
+            for name, prop in obj.properties.items()
+        },
+        sources=obj.sources.copy(),
+    )
+
+
+class Watcher:
+    """
+    Long-running watcher of the API docs which keeps the HTTP session and the parsed model between polls.
+
+    Each poll revalidates the API details through the HTTP cache, only APIs whose contents changed are parsed again.
+    Objects defined by the changed (or removed) APIs and objects referencing them are then regenerated,
+    files of all the other objects are kept as they are.
+    """
+
+    def __init__(self, interval: float = 3600.0, base_url: str = DOCS_URL, workers: int = 1,
+                 cache: HttpCache = None, store: InputStore = None, parser: str = "html5lib", parse_workers: int = 1,
+                 update_copyright_year: bool = False, generate_workers: int = 1,
+                 targets: list[str] = ("php",), templates: dict[str, str] = None,
+                 scheduler: RequestScheduler = None, selection: ResourceSelection = None):
+        self.interval = interval
+        self.base_url = base_url
+        self.workers = workers
+        # conditional requests make polling of unchanged API details cheap
+        self.cache = cache or HttpCache()
+        self.store = store or InputStore()
+        self.parser = parser
+        self.parse_workers = parse_workers
+        self.update_copyright_year = update_copyright_year
+        self.generate_workers = generate_workers
+        self.targets = targets
+        self.templates = templates or {}
+        self.selection = selection
+
+        self.session = create_session(workers, scheduler)
+        self.api_names: list[str] = []
+        self.resources: list[Resource] = []
+        self.objects: list[ObjectDefinition] = []
+        self.polls = 0
+
+        self._digests: dict[str, str] = {}
+        self._results: dict[str, list[tuple[Resource, dict[str, ObjectDefinition]]]] = {}
+        self._generated = False
+
+    def _poll(self) -> tuple[list[str], dict[str, str], set[str]]:
+        api_names = download_api_names(self.session, self.base_url, self.cache)
+        changed = {}
+        downloaded = set()
+        for api_name, html in download_iter(self.workers, self.base_url, self.cache, self.store,
+                                            session=self.session, api_names=api_names, selection=self.selection):
+            downloaded.add(api_name)
+            if self._digests.get(api_name) != _digest(html):
+                changed[api_name] = html
+
+        # APIs which failed to be downloaded keep their previous definitions
+        api_names = [api_name for api_name in api_names if api_name in downloaded or api_name in self._results]
+        removed = self._results.keys() - set(api_names)
+        return api_names, changed, removed
+
+    @staticmethod
+    def _object_names(results: dict[str, list[tuple[Resource, dict[str, ObjectDefinition]]]],
+                      api_names: set[str]) -> set[str]:
+        return {
+            object_name
+            for api_name in api_names
+            for _, partial_objects in results.get(api_name, [])
+            for object_name in partial_objects
+        }
+
+    @staticmethod
+    def _merge(api_names: list[str], results: dict[str, list[tuple[Resource, dict[str, ObjectDefinition]]]]
+               ) -> tuple[list[Resource], list[ObjectDefinition]]:
+        resources = []
+        objects: dict[str, ObjectDefinition] = dict()
+        for api_name in api_names:
+            for resource, partial_objects in results[api_name]:
+                resources.append(resource)
+                _merge_objects(objects, {name: _copy_object(obj) for name, obj in partial_objects.items()})
+
+        return resources, list(objects.values())
+
+    def update(self) -> set[str] | None:
+        """
+        Polls the docs once and regenerates the output of the affected objects. Returns names of the affected
+        objects, None when the whole output was generated.
+
+        The kept model is updated only once the output is generated, changes of a failed poll are picked up again
+        by the next one. APIs which fail to be parsed keep their previous definitions, new ones are left out.
+        """
+        self.polls += 1
+        with profiler.phase("download"):
+            api_names, changed, removed = self._poll()
+
+        if not changed and not removed:
+            log.info("no API changed since the previous poll")
+            return set()
+
+        log.info("changed APIs: %s, removed APIs: %s", sorted(changed), sorted(removed))
+        with profiler.phase("parse"):
+            parsed = {}
+            documents = _parse_documents(changed.values(), self.parser, self.parse_workers, selection=self.selection,
+                                         skip_errors=True)
+            for api_name, api_results in zip(changed, documents):
+                if api_results is not None:
+                    parsed[api_name] = api_results
+
+            if failed := changed.keys() - parsed.keys():
+                log.warning("APIs %s failed to be parsed, they are parsed again by the next poll", sorted(failed))
+
+            if not parsed and not removed:
+                return set()
+
+            results = {api_name: api_results for api_name, api_results in self._results.items()
+                       if api_name not in removed}
+            results.update(parsed)
+            api_names = [api_name for api_name in api_names if api_name in results]
+
+            affected = self._object_names(self._results, parsed.keys() | removed)
+            affected |= self._object_names(results, parsed.keys())
+            resources, objects = self._merge(api_names, results)
+            affected |= referencing_objects(objects, affected)
+
+        with profiler.phase("generate"):
+            converters = [
+                create_converter(target, resources, self.templates.get(target))
+                for target in self.targets
+            ]
+            generate(resources, objects, update_copyright_year=self.update_copyright_year,
+                     workers=self.generate_workers, converters=converters,
+                     affected=affected if self._generated else None, selection=self.selection)
+
+        self.api_names, self.resources, self.objects, self._results = api_names, resources, objects, results
+        for api_name in removed:
+            del self._digests[api_name]
+
+        for api_name in parsed:
+            self._digests[api_name] = _digest(changed[api_name])
+
+        if not self._generated:
+            self._generated = True
+            return None
+
+        return affected
+
+    def run(self, polls: int = None):
+        log.info("watching %s, polling every %.0f seconds", self.base_url, self.interval)
+        try:
+            while polls is None or self.polls < polls:
+                started = time.monotonic()
+                try:
+                    self.update()
+
+                except Exception as ex:
+                    log.exception("poll of the API docs failed!")
+
+                if polls is None or self.polls < polls:
+                    time.sleep(max(0.0, self.interval - (time.monotonic() - started)))
+
+        finally:
+            self.session.close()
@@ -0,0 +1,37 @@
+import json
+import os
+
+import pytest
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+FIXTURE_APIS = ("champion-mastery-v4", "lol-status-v3", "tft-league-v1")
+
+
+def read_fixture(api_name: str) -> str:
+    with open(os.path.join(FIXTURES_DIR, "api_details", f"{api_name}.html"), "r", encoding="utf-8") as fd:
+        return fd.read()
+
+
+@pytest.fixture
+def apis() -> dict[str, str]:
+    """API details of the golden corpus keyed by API name in the landing page order."""
+    return {api_name: read_fixture(api_name) for api_name in FIXTURE_APIS}
+
+
+@pytest.fixture
+def expected() -> list:
+    """
+    Canonical parse result of the golden corpus, see `tests.helpers.canonical`.
+
+    Generated from the `html5lib` output of the original single-document parser, with property types kept
+    as the raw type strings and the ignored resources left out, as the current parser does.
+    """
+    with open(os.path.join(FIXTURES_DIR, "expected.json"), "r", encoding="utf-8") as fd:
+        return json.load(fd)
+
+
+@pytest.fixture
+def workdir(tmp_path, monkeypatch) -> str:
+    """Empty working directory, inputs, caches and outputs are written relative to it."""
+    monkeypatch.chdir(tmp_path)
+    return str(tmp_path)
@@ -0,0 +1,29 @@
+from docs_parser.objects import Resource, ObjectDefinition
+
+
+def canonical(resources: list[Resource], objects: list[ObjectDefinition]) -> tuple:
+    """
+    Complete, order-preserving representation of a parse result.
+
+    Dataclass equality of the parsed objects compares only a subset of their fields,
+    this representation covers every field so two parse results can be checked for identity.
+    """
+    def sources(srcs):
+        return tuple(
+            (resource.id, tuple(sorted((op.id, op.method) for op in operations)))
+            for resource, operations in srcs.items()
+        )
+
+    return (
+        tuple(
+            (r.id, r.name, r.version, r.api_link,
+             tuple((op.id, op.method, op.returns, op.docs_link, op.api_path) for op in r.operations))
+            for r in resources
+        ),
+        tuple(
+            (obj.name, obj.description, sources(obj.sources),
+             tuple((prop.name, prop.type, prop.description, prop.is_array, sources(prop.sources))
+                   for prop in obj.properties.values()))
+            for obj in objects
+        ),
+    )
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import logging
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+log = logging.getLogger("tests.stub_server")
+
+
+class StubDocsServer:
+    """
+    Local stand-in for https://developer.riotgames.com serving the `/apis` landing page
+    and the `/api-details/{name}` JSON endpoint from in-memory payloads.
+
+    With `rate_limit`, requests over the given number per second are throttled by `429 Too Many Requests`
+    with a `Retry-After` header, like the real server does.
+    """
+
+    def __init__(self, apis: dict[str, str], latency: float = 0.0, failing: set[str] = None,
+                 rate_limit: float = None, retry_after: float = 1.0):
+        self.apis = apis
+        self.latency = latency
+        self.failing = failing or set()
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.request_count = 0
+        self.not_modified_count = 0
+        self.throttled_count = 0
+        self.last_modified = formatdate(time.time(), usegmt=True)
+
+        self._lock = threading.Lock()
+        self._tokens = rate_limit or 0.0
+        self._updated = time.monotonic()
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def landing_page(self) -> str:
+        options = "".join(f'<a class="api_option" api-name="{name}">{name}</a>' for name in self.apis)
+        return f"<html><body>{options}</body></html>"
+
+    def _throttle(self) -> bool:
+        if self.rate_limit is None:
+            return False
+
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._updated) * self.rate_limit)
+            self._updated = now
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                return False
+
+            self.throttled_count += 1
+            return True
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            def do_GET(self):
+                stub.request_count += 1
+                if stub._throttle():
+                    self.send_response(429)
+                    self.send_header("Retry-After", f"{stub.retry_after:g}")
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+
+                if stub.latency:
+                    time.sleep(stub.latency)
+
+                if self.path == "/apis":
+                    self._respond(200, "text/html", stub.landing_page())
+                    return
+
+                _, prefix, api_name = self.path.split("/", maxsplit=2)
+                if prefix != "api-details" or api_name not in stub.apis:
+                    self._respond(404, "text/plain", "not found")
+
+                elif api_name in stub.failing:
+                    self._respond(500, "text/plain", "internal server error")
+
+                else:
+                    self._respond(200, "application/json", json.dumps({"html": stub.apis[api_name]}))
+
+            def _respond(self, status: int, content_type: str, body: str):
+                data = body.encode("utf-8")
+                etag = None
+                if status == 200:
+                    etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                    if self.headers.get("If-None-Match") == etag:
+                        stub.not_modified_count += 1
+                        self.send_response(304)
+                        self.send_header("ETag", etag)
+                        self.end_headers()
+                        return
+
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                if etag is not None:
+                    self.send_header("ETag", etag)
+                    self.send_header("Last-Modified", stub.last_modified)
+
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                log.debug(format, *args)
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._server.shutdown()
+        self._server.server_close()
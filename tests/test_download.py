@@ -0,0 +1,32 @@
+import pytest
+
+from docs_parser.input_store import InputStore
+from docs_parser.run import download_iter
+from docs_parser.scheduler import RequestScheduler
+from tests.stub_server import StubDocsServer
+
+
+@pytest.mark.parametrize("workers", [1, 3])
+def test_download_keeps_landing_page_order(workdir, apis, workers):
+    with StubDocsServer(apis, latency=0.02) as stub:
+        downloaded = list(download_iter(workers=workers, base_url=stub.base_url))
+
+    assert downloaded == list(apis.items())
+    assert InputStore().names() == list(apis)
+    assert list(InputStore()) == list(apis.values())
+
+
+def test_scheduled_download_keeps_landing_page_order(workdir, apis):
+    with StubDocsServer(apis, latency=0.02) as stub:
+        downloaded = list(download_iter(workers=3, base_url=stub.base_url, scheduler=RequestScheduler()))
+
+    assert downloaded == list(apis.items())
+
+
+def test_failed_downloads_are_reported(workdir, apis, caplog):
+    with StubDocsServer(apis, failing={"lol-status-v3"}) as stub:
+        downloaded = [api_name for api_name, _ in download_iter(workers=3, base_url=stub.base_url)]
+
+    assert downloaded == ["champion-mastery-v4", "tft-league-v1"]
+    assert InputStore().names() == downloaded
+    assert "some API details failed to be downloaded: ['lol-status-v3']" in caplog.text
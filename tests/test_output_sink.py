@@ -0,0 +1,67 @@
+import os
+
+from docs_parser.output_sink import DirectorySink
+
+
+def read_tree(directory: str) -> dict[str, bytes]:
+    files = {}
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            with open(os.path.join(dirpath, filename), "rb") as fd:
+                files[os.path.relpath(os.path.join(dirpath, filename), directory)] = fd.read()
+
+    return files
+
+
+def run(written: dict[str, bytes], removed: tuple[str, ...] = (), abort: bool = False):
+    sink = DirectorySink()
+    sink.begin(["output"], workers=2)
+    for relpath, data in written.items():
+        sink.write(f"output/{relpath}", data)
+
+    for relpath in removed:
+        sink.remove(f"output/{relpath}")
+
+    if abort:
+        sink.abort()
+
+    else:
+        sink.commit()
+
+
+def test_changes_are_swapped_into_output(workdir):
+    run({"a/1.php": b"1", "a/2.php": b"2", "b/3.php": b"3"})
+    output_inode = os.stat("output").st_ino
+    run({"a/1.php": b"one"}, removed=("a/2.php",))
+
+    assert read_tree("output") == {"a/1.php": b"one", "b/3.php": b"3"}
+    # the previous tree is kept for the next run, it was exchanged with the staging directory
+    assert read_tree("output.staging") == {"a/1.php": b"1", "a/2.php": b"2", "b/3.php": b"3"}
+    assert os.stat("output.staging").st_ino == output_inode
+
+    run({"b/3.php": b"three"})
+    assert read_tree("output") == {"a/1.php": b"one", "b/3.php": b"three"}
+
+
+def test_files_changed_outside_of_the_sink_are_kept(workdir):
+    run({"a/1.php": b"1", "a/2.php": b"2"})
+    run({"a/1.php": b"one"})
+    with open("output/README", "wb") as fd:
+        fd.write(b"readme")
+
+    # editors usually replace the file rather than writing it in place
+    os.remove("output/a/2.php")
+    with open("output/a/2.php", "wb") as fd:
+        fd.write(b"edited")
+
+    run({"a/3.php": b"3"})
+    assert read_tree("output") == {"a/1.php": b"one", "a/2.php": b"edited", "a/3.php": b"3", "README": b"readme"}
+
+
+def test_abort_leaves_output_untouched(workdir):
+    run({"a/1.php": b"1", "a/2.php": b"2"})
+    run({"a/1.php": b"one"}, removed=("a/2.php",), abort=True)
+    assert read_tree("output") == {"a/1.php": b"1", "a/2.php": b"2"}
+
+    run({"a/3.php": b"3"})
+    assert read_tree("output") == {"a/1.php": b"1", "a/2.php": b"2", "a/3.php": b"3"}
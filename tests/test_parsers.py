@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+from tests.helpers import canonical
+from docs_parser.extraction import EXTRACTORS
+from docs_parser.parse_cache import ParseCache
+from docs_parser.run import PARSER_BACKENDS, create_selection, parse
+
+
+def _canonical_json(resources, objects) -> list:
+    # the expected output is stored as JSON, tuples are compared as lists
+    return json.loads(json.dumps(canonical(resources, objects)))
+
+
+@pytest.mark.parametrize("extractor", EXTRACTORS)
+@pytest.mark.parametrize("parser", PARSER_BACKENDS)
+def test_golden_corpus(apis, expected, parser, extractor):
+    resources, objects = parse(list(apis.values()), parser=parser, extractor=extractor)
+    assert _canonical_json(resources, objects) == expected
+
+
+def test_ignored_resources_are_not_parsed(apis):
+    resources, objects = parse(list(apis.values()), parser="lxml")
+    assert [resource.id for resource in resources] == [1418, 1466]
+    assert "ShardStatus" not in {obj.name for obj in objects}
+
+
+def test_ignored_resources_can_be_included(apis):
+    resources, objects = parse(list(apis.values()), parser="lxml", selection=create_selection(["id=1246"]))
+    assert [resource.id for resource in resources] == [1246]
+    assert [obj.name for obj in objects] == ["ShardStatus"]
+
+
+def test_parse_workers(apis, expected):
+    resources, objects = parse(list(apis.values()), parser="lxml", workers=2)
+    assert _canonical_json(resources, objects) == expected
+
+
+def test_parse_cache_is_keyed_by_parser_and_extractor(workdir, apis, expected):
+    cache = ParseCache()
+    for parser, extractor in [("lxml", "single-pass"), ("html.parser", "single-pass"), ("lxml", "select")]:
+        resources, objects = parse(list(apis.values()), parser=parser, cache=cache, extractor=extractor)
+        assert _canonical_json(resources, objects) == expected
+
+    assert cache.stats["hit"] == 0
+
+    parse(list(apis.values()), parser="html.parser", cache=cache)
+    # the document of the ignored resource is not parsed, nor cached
+    assert cache.stats["hit"] == len(apis) - 1
@@ -0,0 +1,55 @@
+import time
+
+import pytest
+
+from docs_parser.run import create_session
+from docs_parser.scheduler import CircuitOpenError, RequestScheduler
+from tests.stub_server import StubDocsServer
+
+
+def test_rate_adapts_to_throttling(apis):
+    scheduler = RequestScheduler(rate=100.0, max_rate=100.0)
+    with StubDocsServer(apis, rate_limit=20.0, retry_after=0.1) as stub:
+        session = create_session(1, scheduler)
+        responses = [session.get(f"{stub.base_url}/api-details/champion-mastery-v4") for _ in range(30)]
+
+    assert [response.status_code for response in responses] == [200] * 30
+    assert stub.throttled_count > 0
+    assert scheduler.stats["throttled"] == stub.throttled_count
+    assert scheduler.rate < 100.0
+
+
+def test_retry_after_is_capped(apis):
+    scheduler = RequestScheduler(max_pause=0.05, breaker_threshold=3)
+    with StubDocsServer(apis, rate_limit=0.001, retry_after=86400) as stub:
+        session = create_session(1, scheduler)
+        start = time.monotonic()
+        with pytest.raises(CircuitOpenError):
+            session.get(f"{stub.base_url}/apis")
+
+    assert time.monotonic() - start < 5.0
+    assert scheduler.stats["circuits_opened"] == 1
+    assert stub.request_count == 3
+
+
+def test_failing_url_opens_circuit(apis):
+    scheduler = RequestScheduler(max_retries=1, backoff_base=0.001, breaker_threshold=2)
+    with StubDocsServer(apis, failing={"lol-status-v3"}) as stub:
+        session = create_session(1, scheduler)
+        url = f"{stub.base_url}/api-details/lol-status-v3"
+        assert session.get(url).status_code == 500
+        assert session.get(url).status_code == 500
+        with pytest.raises(CircuitOpenError):
+            session.get(url)
+
+        # other URLs of the host are not affected
+        assert session.get(f"{stub.base_url}/api-details/tft-league-v1").status_code == 200
+
+    assert stub.request_count == 5
+    assert scheduler.stats["retried"] == 2
+    assert scheduler.stats["rejected"] == 1
+
+
+def test_scheduled_session_does_not_retry_in_urllib3():
+    session = create_session(4, RequestScheduler())
+    assert session.get_adapter("http://localhost").max_retries.total == 0
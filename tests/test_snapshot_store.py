@@ -0,0 +1,26 @@
+from docs_parser.run import create_selection, download
+from docs_parser.snapshot_store import SnapshotStore
+from tests.stub_server import StubDocsServer
+
+
+def test_snapshots_of_the_same_second_are_numbered_in_order(workdir):
+    snapshots = SnapshotStore()
+    digest = snapshots.write_blob("<div></div>")
+    names = [snapshots.write_manifest([("api-v1", digest)], name="20240101T120000Z") for _ in range(12)]
+
+    assert names[1:3] == ["20240101T120000Z-1", "20240101T120000Z-2"]
+    assert snapshots.names() == names
+    assert snapshots.open().name == "20240101T120000Z-11"
+
+
+def test_subset_download_is_not_the_latest_snapshot(workdir, apis):
+    snapshots = SnapshotStore()
+    with StubDocsServer(apis) as stub:
+        download(base_url=stub.base_url, snapshots=snapshots)
+        complete = snapshots.open()
+        download(base_url=stub.base_url, snapshots=snapshots, selection=create_selection(["api=tft-league-v1"]))
+
+    subset = snapshots.open(snapshots.names()[-1])
+    assert subset.subset and subset.names() == ["tft-league-v1"]
+    assert not complete.subset and complete.names() == list(apis)
+    assert snapshots.open().name == complete.name
@@ -0,0 +1,89 @@
+import os
+import tempfile
+
+import pytest
+
+import docs_parser.watch
+from docs_parser.http_cache import HttpCache
+from docs_parser.run import generate, parse
+from docs_parser.watch import Watcher
+from tests.stub_server import StubDocsServer
+
+
+def read_output(directory: str = "output") -> dict[str, bytes]:
+    files = {}
+    for dirpath, _, filenames in os.walk(directory):
+        for filename in filenames:
+            if filename != ".manifest.json":
+                with open(os.path.join(dirpath, filename), "rb") as fd:
+                    files[os.path.relpath(os.path.join(dirpath, filename), directory)] = fd.read()
+
+    return files
+
+
+def expected_output(apis: dict[str, str]) -> dict[str, bytes]:
+    # output of a single run over the current API details
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            generate(*parse(list(apis.values()), parser="lxml"))
+            return read_output()
+
+        finally:
+            os.chdir(cwd)
+
+
+@pytest.fixture
+def stub(apis):
+    with StubDocsServer(apis) as stub:
+        yield stub
+
+
+@pytest.fixture
+def watcher(workdir, stub) -> Watcher:
+    watcher = Watcher(interval=0, base_url=stub.base_url, parser="lxml", cache=HttpCache())
+    yield watcher
+    watcher.session.close()
+
+
+def test_only_changed_apis_are_regenerated(watcher, stub, apis):
+    assert watcher.update() is None
+    assert read_output() == expected_output(apis)
+
+    not_modified = stub.not_modified_count
+    assert watcher.update() == set()
+    # the landing page and all the API details are revalidated
+    assert stub.not_modified_count - not_modified == len(apis) + 1
+
+    apis["champion-mastery-v4"] = apis["champion-mastery-v4"].replace("Reward marks.", "Reward points.")
+    assert watcher.update() == {"NextSeasonMilestonesDto", "ChampionMasteryDto"}
+    assert read_output() == expected_output(apis)
+
+
+def test_failed_generation_is_retried(watcher, apis, monkeypatch):
+    watcher.update()
+    apis["tft-league-v1"] = apis["tft-league-v1"].replace("Promotion series.", "Promotion.")
+
+    def failing_generate(*args, **kwargs):
+        raise OSError("no space left on device")
+
+    with monkeypatch.context() as patch:
+        patch.setattr(docs_parser.watch, "generate", failing_generate)
+        with pytest.raises(OSError):
+            watcher.update()
+
+    assert watcher.update() == {"LeagueEntryDto", "MiniSeriesDto", "TopRatedLadderEntryDto"}
+    assert read_output() == expected_output(apis)
+
+
+def test_api_failing_to_parse_is_skipped(watcher, apis):
+    watcher.update()
+    apis["broken-v1"] = '<div class="resource" id="resource_9999"></div>'
+    assert watcher.update() == set()
+    assert "broken-v1" not in watcher.api_names
+
+    apis["champion-mastery-v4"] = apis["champion-mastery-v4"].replace("Reward marks.", "Reward points.")
+    assert watcher.update() == {"NextSeasonMilestonesDto", "ChampionMasteryDto"}
+    del apis["broken-v1"]
+    assert read_output() == expected_output(apis)